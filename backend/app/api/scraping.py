@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 import uuid
 import logging
+from dataclasses import asdict
+from datetime import datetime
 
 from ..core.database import get_db
 from ..models.scraping import (
@@ -60,7 +62,7 @@ async def analyze_extraction_method(
         
         return {
             "status": "success",
-            "analysis": analysis,
+            "analysis": asdict(analysis),
             "recommendation": recommendation,
             "page_info": {
                 "title": page_content.get("title"),
@@ -102,19 +104,38 @@ async def create_scraping_job(
 
 @router.get("/jobs", response_model=List[ScrapingJobResponse])
 async def list_scraping_jobs(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     user_id: str = "anonymous",
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None
 ):
     """
-    List scraping jobs for a user
+    List scraping jobs for a user.
+    When a full page is returned, the X-Next-Cursor header holds the cursor for the next one.
     """
     try:
+        keyset = None
+        if cursor:
+            try:
+                created_at, job_id = cursor.rsplit(",", 1)
+                # An unencoded "+" in the UTC offset arrives as a space
+                keyset = (datetime.fromisoformat(created_at.replace(" ", "+")), uuid.UUID(job_id))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        
         scraping_service = get_scraping_service()
-        jobs = await scraping_service.list_jobs(db, user_id, limit, offset)
+        jobs = await scraping_service.list_jobs(db, user_id, limit, offset, cursor=keyset)
+        
+        if jobs and len(jobs) == limit:
+            last = jobs[-1]
+            response.headers["X-Next-Cursor"] = f"{last.created_at.isoformat()},{last.id}"
+        
         return jobs
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing scraping jobs: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -152,12 +173,13 @@ async def get_scraping_results(
     """
     try:
         scraping_service = get_scraping_service()
-        results = await scraping_service.get_job_results(job_id, db)
+        # Already JSON from the database; pass it through without re-encoding
+        results_json = await scraping_service.get_job_results_json(job_id, db)
         
-        if not results:
+        if not results_json:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        return results
+        return Response(content=results_json, media_type="application/json")
         
     except HTTPException:
         raise
@@ -188,6 +210,29 @@ async def get_scraping_script(
         logger.error(f"Error getting scraping script for {job_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/jobs/{job_id}/overview")
+async def get_scraping_job_overview(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a scraping job's status together with its latest generated script
+    """
+    try:
+        scraping_service = get_scraping_service()
+        overview = await scraping_service.get_job_overview(job_id, db)
+        
+        if not overview:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        return overview
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting scraping job overview for {job_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/jobs/{job_id}/start")
 async def start_scraping_job(
     job_id: uuid.UUID,
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from typing import Dict, List
 import json
+import orjson
 import asyncio
 import uuid
 import logging
@@ -44,11 +45,12 @@ class ConnectionManager:
         """Send update to all clients subscribed to a specific job"""
         if job_id in self.job_subscribers:
             disconnected_clients = []
+            payload = orjson.dumps(message)
             
             for client_id in self.job_subscribers[job_id]:
                 try:
                     if client_id in self.active_connections:
-                        await self.active_connections[client_id].send_text(json.dumps(message))
+                        await self.active_connections[client_id].send_bytes(payload)
                     else:
                         disconnected_clients.append(client_id)
                 except Exception as e:
@@ -77,12 +79,18 @@ class ConnectionManager:
                 del self.job_subscribers[job_id]
             logger.info(f"Client {client_id} unsubscribed from job {job_id}")
     
+    def has_subscribers(self) -> bool:
+        """Check whether any client is connected to receive broadcasts"""
+        return bool(self.active_connections)
+    
     async def broadcast_to_all(self, message: dict):
         """Send update to all active connections"""
+        # Serialize once for every client; orjson handles UUID and datetime values natively
+        payload = orjson.dumps(message)
         disconnected_clients = []
-        for client_id, websocket in self.active_connections.items():
+        for client_id, websocket in list(self.active_connections.items()):
             try:
-                await websocket.send_text(json.dumps(message))
+                await websocket.send_bytes(payload)
             except Exception as e:
                 logger.error(f"Error broadcasting to {client_id}: {str(e)}")
                 disconnected_clients.append(client_id)
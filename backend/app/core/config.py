@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict, Any, List
 import os
 from dotenv import load_dotenv
 
@@ -29,9 +29,30 @@ class Settings(BaseSettings):
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     
     # Scraping settings
-    max_concurrent_jobs: int = 5
+    max_concurrent_jobs: int = int(os.getenv("SCRAPING_CONCURRENCY", "5"))  # Jobs beyond this queue
+    llm_concurrency: int = int(os.getenv("LLM_CONCURRENCY", "4"))  # Concurrent script generation calls
+    browser_concurrency: int = int(os.getenv("BROWSER_CONCURRENCY", "4"))  # Concurrent page loads on the shared browser
     job_timeout_minutes: int = 45  # Increased timeout for complex apps
     page_load_timeout_seconds: int = 90  # Page load timeout
+    browser_context_pool_size: int = int(os.getenv("BROWSER_CONTEXT_POOL_SIZE", "4"))  # Pre-warmed browser contexts
+    # Optional on-disk Chromium profile for the shared job browser, so its HTTP cache
+    # survives restarts. All pool slots then share ONE context (cookies, localStorage),
+    # so concurrent jobs are not isolated from each other. Off (ephemeral) by default;
+    # each worker process needs its own WORKER_ID to get a separate profile directory.
+    browser_user_data_dir: str = os.getenv("BROWSER_USER_DATA_DIR", "")
+    page_cache_max_entries: int = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "128"))
+    page_cache_ttl_seconds: int = int(os.getenv("PAGE_CACHE_TTL_SECONDS", "300"))
+    
+    # HTTP record/replay cache for page subresources
+    http_cache_enabled: bool = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+    http_cache_dir: str = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+    http_cache_ttl_seconds: int = int(os.getenv("HTTP_CACHE_TTL_SECONDS", "86400"))
+    http_cache_max_bytes: int = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))  # 0 for unbounded
+    http_cache_resource_types: List[str] = ["script", "stylesheet", "image", "font", "media"]
+    http_cache_domain_rules: Dict[str, Dict[str, Any]] = {}  # Per-domain overrides, see HttpCache
+    
+    # Install Playwright browsers on startup (the Docker image installs them at build time)
+    auto_install_browsers: bool = os.getenv("SCRAPER_AUTO_INSTALL_BROWSERS", "false").lower() == "true"
     
     # Debug
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
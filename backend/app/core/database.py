@@ -1,13 +1,20 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy import MetaData
+import orjson
 from .config import settings
 
-# Create async engine
+def _json_serializer(value) -> str:
+    return orjson.dumps(value).decode()
+
+# Create async engine; JSON columns (extracted data can be several MB) are
+# encoded/decoded with orjson instead of the stdlib json module
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    future=True
+    future=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 # Create async session factory
@@ -3,9 +3,10 @@ Enhanced Schema Definitions for LLM Scraper
 Provides both Zod-equivalent validation and JSON Schema formats
 """
 
-from typing import Dict, Any, List, Optional, Union
-from pydantic import BaseModel, Field
+from typing import Callable, Dict, Any, FrozenSet, List, Optional, Tuple, Union
+from pydantic import BaseModel, Field, PrivateAttr
 from enum import Enum
+import re
 
 class FieldType(str, Enum):
     STRING = "string"
@@ -25,6 +26,21 @@ class SchemaField(BaseModel):
     validation_pattern: Optional[str] = Field(None, description="Regex pattern for validation")
     min_length: Optional[int] = Field(None, description="Minimum string length")
     max_length: Optional[int] = Field(None, description="Maximum string length")
+    
+    class Config:
+        # Validators are compiled from these values, so they must not change afterwards
+        frozen = True
+    
+    # Bound match() of the compiled validation_pattern; None if the pattern is
+    # empty, unset or not a valid regex
+    _match: Optional[Callable[[str], Optional[re.Match]]] = PrivateAttr(default=None)
+    
+    def model_post_init(self, __context: Any) -> None:
+        if self.validation_pattern:
+            try:
+                self._match = re.compile(self.validation_pattern).match
+            except re.error:
+                self._match = None
 
 class EnhancedSchemaDefinition(BaseModel):
     """Enhanced schema definition with full validation support"""
@@ -34,6 +50,39 @@ class EnhancedSchemaDefinition(BaseModel):
     fields: Dict[str, SchemaField] = Field(..., description="Field definitions")
     examples: Optional[List[Dict[str, Any]]] = Field(None, description="Example data structures")
     
+    class Config:
+        # Required fields and validators are cached per instance
+        frozen = True
+    
+    _required_fields: Optional[FrozenSet[str]] = PrivateAttr(default=None)
+    # Per-field validators, compiled by compiled_validators on first use
+    _field_validators: Optional[Tuple[Any, ...]] = PrivateAttr(default=None)
+    
+    @property
+    def required_fields(self) -> FrozenSet[str]:
+        """Names of the required fields, computed on first use"""
+        if self._required_fields is None:
+            self._required_fields = frozenset(
+                name for name, field in self.fields.items() if field.required
+            )
+        return self._required_fields
+    
+    def compiled_validators(
+        self, compile_field: Callable[[str, SchemaField], Optional[Any]]
+    ) -> Tuple[Any, ...]:
+        """
+        (field name, validator) pairs, compiled with compile_field on first use.
+        Fields for which compile_field returns None are left out.
+        """
+        if self._field_validators is None:
+            compiled = []
+            for field_name, field_def in self.fields.items():
+                validator = compile_field(field_name, field_def)
+                if validator is not None:
+                    compiled.append((field_name, validator))
+            self._field_validators = tuple(compiled)
+        return self._field_validators
+    
     def to_json_schema(self) -> Dict[str, Any]:
         """Convert to standard JSON Schema format"""
         if self.type == "array":
@@ -1,9 +1,10 @@
 from .ai_service import AIService
 from .playwright_service import PlaywrightService
-from .scraping_service import ScrapingService
+from .scraping_service import ScrapingService, ScrapingServiceError
 
 __all__ = [
     "AIService",
     "PlaywrightService", 
-    "ScrapingService"
+    "ScrapingService",
+    "ScrapingServiceError"
 ]
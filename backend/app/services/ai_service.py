@@ -3,10 +3,11 @@ from typing import Dict, Any, Optional, List
 import json
 import re
 import logging
+from dataclasses import asdict
 from ..core.config import settings
 from ..models.scraping import COMMON_SCHEMAS
 from ..schemas.extraction_schemas import get_schema_by_name, ENHANCED_SCHEMAS
-from .extraction_analyzer import ExtractionAnalyzer
+from .extraction_analyzer import ExtractionAnalyzer, ExtractionAnalysis
 
 logger = logging.getLogger(__name__)
 from ..utils.schema_converter import SchemaConverter
@@ -51,7 +52,7 @@ class AIService:
             truncated_html = self._truncate_html(html_content, max_length=8000)
         
             # Create the prompt based on extraction method
-            extraction_method = extraction_analysis["method"]
+            extraction_method = extraction_analysis.method
             
             if extraction_method == "javascript":
                 system_prompt = self._create_javascript_system_prompt()
@@ -84,7 +85,7 @@ class AIService:
                     "status": "success",
                     "script": cleaned_script,
                     "extraction_method": extraction_method,
-                    "extraction_analysis": extraction_analysis,
+                    "extraction_analysis": asdict(extraction_analysis),
                     "model": "gpt-4",
                     "usage": response.usage.model_dump() if response.usage else None
                 }
@@ -95,7 +96,7 @@ class AIService:
                     "status": "success",
                     "script": fallback_script,
                     "extraction_method": extraction_method,
-                    "extraction_analysis": extraction_analysis,
+                    "extraction_analysis": asdict(extraction_analysis),
                     "model": "gpt-4",
                     "usage": response.usage.model_dump() if response.usage else None
                 }
@@ -446,19 +447,19 @@ THINK LIKE AN EXPERT: What would a human scraper expert extract from this site t
         html: str, 
         url: str, 
         schema: Dict[str, Any], 
-        analysis: Dict[str, Any]
+        analysis: ExtractionAnalysis
     ) -> str:
         """Create user prompt for JavaScript extraction"""
         return f"""
         TARGET WEBSITE: {url}
         EXTRACTION METHOD: JavaScript (Simple/Fast)
-        COMPLEXITY SCORE: {analysis['complexity_score']:.2f}
+        COMPLEXITY SCORE: {analysis.complexity_score:.2f}
         
         ANALYSIS INSIGHTS:
-        {chr(10).join(f'• {reason}' for reason in analysis.get('reasons', [])[:5])}
+        {chr(10).join(f'• {reason}' for reason in analysis.reasons[:5])}
         
         EXTRACTION HINTS:
-        {chr(10).join(f'• {hint}' for hint in analysis.get('extraction_hints', []))}
+        {chr(10).join(f'• {hint}' for hint in analysis.extraction_hints)}
         
         HTML CONTENT TO ANALYZE:
         {html}
@@ -467,7 +468,7 @@ THINK LIKE AN EXPERT: What would a human scraper expert extract from this site t
         {json.dumps(schema, indent=2)}
         
         ZOD VALIDATION REQUIREMENTS:
-        {json.dumps(analysis['zod_validation'], indent=2)}
+        {json.dumps(analysis.zod_validation, indent=2)}
         
         Generate clean JavaScript code that:
         1. Extracts data matching the schema structure
@@ -485,21 +486,21 @@ THINK LIKE AN EXPERT: What would a human scraper expert extract from this site t
         html: str, 
         url: str, 
         schema: Dict[str, Any], 
-        analysis: Dict[str, Any]
+        analysis: ExtractionAnalysis
     ) -> str:
         """Create user prompt for Playwright extraction"""
         return f"""
         TARGET WEBSITE: {url}
         EXTRACTION METHOD: Playwright (Complex/Interactive)
-        COMPLEXITY SCORE: {analysis['complexity_score']:.2f}
-        REQUIRES INTERACTION: {analysis['requires_interaction']}
-        ESTIMATED LOAD TIME: {analysis['estimated_load_time']} seconds
+        COMPLEXITY SCORE: {analysis.complexity_score:.2f}
+        REQUIRES INTERACTION: {analysis.requires_interaction}
+        ESTIMATED LOAD TIME: {analysis.estimated_load_time} seconds
         
         COMPLEXITY ANALYSIS:
-        {chr(10).join(f'• {reason}' for reason in analysis.get('reasons', [])[:5])}
+        {chr(10).join(f'• {reason}' for reason in analysis.reasons[:5])}
         
         EXTRACTION HINTS:
-        {chr(10).join(f'• {hint}' for hint in analysis.get('extraction_hints', []))}
+        {chr(10).join(f'• {hint}' for hint in analysis.extraction_hints)}
         
         HTML CONTENT TO ANALYZE:
         {html}
@@ -508,7 +509,7 @@ THINK LIKE AN EXPERT: What would a human scraper expert extract from this site t
         {json.dumps(schema, indent=2)}
         
         ZOD VALIDATION REQUIREMENTS:
-        {json.dumps(analysis['zod_validation'], indent=2)}
+        {json.dumps(analysis.zod_validation, indent=2)}
         
         Generate sophisticated JavaScript that:
         1. Handles dynamic content loading and JavaScript rendering
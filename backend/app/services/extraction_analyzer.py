@@ -4,50 +4,177 @@ Determines the best extraction method (JavaScript vs Playwright) based on page c
 """
 
 from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass
 import re
+import json
+import asyncio
+import functools
 import logging
 from urllib.parse import urlparse
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-class ExtractionAnalyzer:
-    def __init__(self):
-        self.js_frameworks = [
-            'react', 'angular', 'vue', 'svelte', 'ember',
-            'backbone', 'knockout', 'polymer', 'lit'
-        ]
-        
-        self.spa_indicators = [
-            'data-reactroot', 'ng-app', 'ng-version', 'v-if', 'v-for',
-            '__NEXT_DATA__', '__NUXT__', 'gatsby', 'webpack'
-        ]
-        
-        self.heavy_js_domains = [
-            'linkedin.com', 'facebook.com', 'twitter.com', 'instagram.com',
-            'youtube.com', 'netflix.com', 'spotify.com', 'slack.com',
-            'discord.com', 'figma.com', 'notion.so', 'airtable.com'
-        ]
+# Keyword/indicator tables are immutable, so build them once at import time
+# instead of per ExtractionAnalyzer instance. Tuples keep scan order (and
+# therefore the order of reported reasons) deterministic.
+_JS_FRAMEWORKS = (
+    'react', 'angular', 'vue', 'svelte', 'ember',
+    'backbone', 'knockout', 'polymer', 'lit'
+)
+
+_SPA_INDICATORS = (
+    'data-reactroot', 'ng-app', 'ng-version', 'v-if', 'v-for',
+    '__NEXT_DATA__', '__NUXT__', 'gatsby', 'webpack'
+)
+
+_HEAVY_JS_DOMAINS = (
+    'linkedin.com', 'facebook.com', 'twitter.com', 'instagram.com',
+    'youtube.com', 'netflix.com', 'spotify.com', 'slack.com',
+    'discord.com', 'figma.com', 'notion.so', 'airtable.com'
+)
+
+_SOCIAL_INDICATORS = ('facebook', 'twitter', 'instagram', 'linkedin', 'tiktok')
+_ECOMMERCE_INDICATORS = ('amazon', 'ebay', 'shopify', 'etsy', 'alibaba')
+_SAAS_INDICATORS = ('app', 'dashboard', 'admin', 'portal', 'console')
+
+_DYNAMIC_INDICATORS = (
+    'data-bind', 'ng-', 'v-', '@click', 'onclick',
+    'data-react', 'data-vue', 'x-data', 'wire:'
+)
+_LOADING_INDICATORS = ('loading', 'spinner', 'skeleton', 'placeholder')
+_AJAX_PATTERNS = ('fetch(', 'axios', 'XMLHttpRequest', '$.ajax', '$.get', '$.post')
+
+_AUTH_INDICATORS = (
+    'login', 'sign in', 'authenticate', 'password',
+    'data-requires-auth', 'protected', 'unauthorized'
+)
+_PAGINATION_INDICATORS = (
+    'load more', 'show more', 'next page', 'pagination',
+    'infinite-scroll', 'lazy-load'
+)
+_MODAL_INDICATORS = ('modal', 'popup', 'dialog', 'overlay')
+_INTERACTION_DOMAINS = (
+    'linkedin.com', 'facebook.com', 'instagram.com',
+    'twitter.com', 'discord.com', 'slack.com'
+)
+
+_NL = "\n"
+
+# Recommendation bodies are formatted per call, but parsed only once here
+_PLAYWRIGHT_RECOMMENDATION = """
+🎭 **Playwright Recommended** (Complexity: {score:.1%})
+
+**Why Playwright?**
+{reasons}
+
+**Expected Load Time:** {load_time} seconds
+**User Interaction Required:** {interaction}
+
+Playwright will handle JavaScript rendering, dynamic content, and complex interactions.
+""".strip()
+
+_JAVASCRIPT_RECOMMENDATION = """
+⚡ **JavaScript Recommended** (Complexity: {score:.1%})
+
+**Why JavaScript?**
+• Simple static content extraction
+• Fast execution (estimated {load_time} seconds)
+• Minimal server resources required
+
+{reasons}
+
+JavaScript extraction will be faster and more efficient for this content.
+""".strip()
+
+@functools.lru_cache(maxsize=256)
+def _build_zod_fields(schema_key: str) -> Dict[str, str]:
+    """Build the per-field Zod strings for a schema, cached by its JSON encoding"""
+    schema_definition = json.loads(schema_key)
     
+    if schema_definition.get("type") == "array":
+        fields = schema_definition.get("items", {})
+    else:
+        fields = schema_definition.get("properties", {})
+
+    zod_schema = {}
+
+    for field_name, field_config in fields.items():
+        if not isinstance(field_config, dict):
+            continue
+
+        config_get = field_config.get
+        field_type = config_get("type", "string")
+        is_required = config_get("required", False)
+
+        # Base Zod type
+        if field_type == "string":
+            zod_type = "z.string()"
+
+            # Add string validations
+            min_length = config_get("minLength")
+            if min_length:
+                zod_type += f".min({min_length})"
+            max_length = config_get("maxLength")
+            if max_length:
+                zod_type += f".max({max_length})"
+            pattern = config_get("validationPattern")
+            if pattern:
+                pattern = pattern.replace("\\", "\\\\")
+                zod_type += f".regex(/{pattern}/)"
+
+        elif field_type == "number":
+            zod_type = "z.number()"
+        elif field_type == "boolean":
+            zod_type = "z.boolean()"
+        elif field_type == "array":
+            zod_type = "z.array(z.string())"  # Simplified array
+        else:
+            zod_type = "z.string()"  # Default fallback
+
+        # Add optional/required
+        if not is_required:
+            zod_type += ".optional()"
+
+        # Add description
+        description = config_get("description")
+        if description:
+            description = description.replace('"', '\\"')
+            zod_type += f'.describe("{description}")'
+
+        zod_schema[field_name] = zod_type
+    
+    return zod_schema
+
+@dataclass(slots=True)
+class ExtractionAnalysis:
+    """Working result of an extraction analysis; converted to a dict at the API boundary"""
+    method: str
+    complexity_score: float
+    reasons: List[str]
+    estimated_load_time: int
+    requires_interaction: bool
+    zod_validation: Dict[str, Any]
+    extraction_hints: List[str]
+
+class ExtractionAnalyzer:
     async def analyze_extraction_requirements(
         self, 
         url: str, 
         html_content: str, 
         schema_definition: Dict[str, Any],
         page_metrics: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> ExtractionAnalysis:
         """
         Analyze page and determine the best extraction method
         
-        Returns:
-        {
-            "method": "javascript" | "playwright",
-            "complexity_score": float,  # 0-1 scale
-            "reasons": List[str],
-            "estimated_load_time": int,  # seconds
-            "requires_interaction": bool,
-            "zod_validation": Dict[str, Any]
-        }
+        Returns an ExtractionAnalysis with:
+            method: "javascript" | "playwright"
+            complexity_score: float  # 0-1 scale
+            reasons: List[str]
+            estimated_load_time: int  # seconds
+            requires_interaction: bool
+            zod_validation: Dict[str, Any]
         """
         
         try:
@@ -55,31 +182,29 @@ class ExtractionAnalyzer:
             parsed_url = urlparse(url)
             domain = parsed_url.netloc.lower()
             
+            # Lowercase once for every case-insensitive scan instead of per indicator
+            html_lower = html_content.lower()
+            
             # Initialize analysis result
-            analysis = {
-                "method": "javascript",
-                "complexity_score": 0.0,
-                "reasons": [],
-                "estimated_load_time": 3,
-                "requires_interaction": False,
-                "zod_validation": self._generate_zod_validation(schema_definition),
-                "extraction_hints": self._generate_extraction_hints(schema_definition, html_content)
-            }
+            analysis = ExtractionAnalysis(
+                method="javascript",
+                complexity_score=0.0,
+                reasons=[],
+                estimated_load_time=3,
+                requires_interaction=False,
+                zod_validation=self._generate_zod_validation(schema_definition),
+                extraction_hints=self._generate_extraction_hints(schema_definition, html_content, html_lower)
+            )
             
             # Analyze different complexity factors
-            complexity_factors = []
-            
-            # 1. Domain-based analysis
-            domain_complexity = self._analyze_domain_complexity(domain)
-            complexity_factors.append(domain_complexity)
-            
-            # 2. HTML content analysis
-            content_complexity = self._analyze_html_complexity(html_content)
-            complexity_factors.append(content_complexity)
-            
-            # 3. Schema complexity analysis
-            schema_complexity = self._analyze_schema_complexity(schema_definition)
-            complexity_factors.append(schema_complexity)
+            # 1. Domain-based, 2. HTML content and 3. schema complexity analysis
+            # are independent CPU-bound scans, so run them off the event loop
+            domain_complexity, content_complexity, schema_complexity = await asyncio.gather(
+                asyncio.to_thread(self._analyze_domain_complexity, domain),
+                asyncio.to_thread(self._analyze_html_complexity, html_content, html_lower),
+                asyncio.to_thread(self._analyze_schema_complexity, schema_definition)
+            )
+            complexity_factors = [domain_complexity, content_complexity, schema_complexity]
             
             # 4. Page metrics analysis (if available)
             if page_metrics:
@@ -87,45 +212,45 @@ class ExtractionAnalyzer:
                 complexity_factors.append(metrics_complexity)
             
             # Calculate overall complexity
-            analysis["complexity_score"] = sum(factor["score"] for factor in complexity_factors) / len(complexity_factors)
+            analysis.complexity_score = sum(factor["score"] for factor in complexity_factors) / len(complexity_factors)
             
             # Collect all reasons
             for factor in complexity_factors:
-                analysis["reasons"].extend(factor["reasons"])
+                analysis.reasons.extend(factor["reasons"])
             
             # Determine extraction method
-            if analysis["complexity_score"] > 0.6:
-                analysis["method"] = "playwright"
-                analysis["estimated_load_time"] = min(90, int(10 + analysis["complexity_score"] * 80))
+            if analysis.complexity_score > 0.6:
+                analysis.method = "playwright"
+                analysis.estimated_load_time = min(90, int(10 + analysis.complexity_score * 80))
             else:
-                analysis["method"] = "javascript"
-                analysis["estimated_load_time"] = min(15, int(3 + analysis["complexity_score"] * 12))
+                analysis.method = "javascript"
+                analysis.estimated_load_time = min(15, int(3 + analysis.complexity_score * 12))
             
             # Check for interaction requirements
-            analysis["requires_interaction"] = self._requires_user_interaction(
-                html_content, schema_definition, domain
+            analysis.requires_interaction = self._requires_user_interaction(
+                html_lower, schema_definition, domain
             )
             
-            if analysis["requires_interaction"]:
-                analysis["method"] = "playwright"
-                analysis["reasons"].append("Requires user interaction (clicks, scrolling, form filling)")
+            if analysis.requires_interaction:
+                analysis.method = "playwright"
+                analysis.reasons.append("Requires user interaction (clicks, scrolling, form filling)")
             
-            logger.info(f"Extraction analysis for {url}: {analysis['method']} (score: {analysis['complexity_score']:.2f})")
+            logger.info(f"Extraction analysis for {url}: {analysis.method} (score: {analysis.complexity_score:.2f})")
             
             return analysis
             
         except Exception as e:
             logger.error(f"Error analyzing extraction requirements: {str(e)}")
             # Fallback to safe default
-            return {
-                "method": "playwright",
-                "complexity_score": 0.8,
-                "reasons": [f"Analysis error, defaulting to Playwright: {str(e)}"],
-                "estimated_load_time": 30,
-                "requires_interaction": False,
-                "zod_validation": self._generate_zod_validation(schema_definition),
-                "extraction_hints": []
-            }
+            return ExtractionAnalysis(
+                method="playwright",
+                complexity_score=0.8,
+                reasons=[f"Analysis error, defaulting to Playwright: {str(e)}"],
+                estimated_load_time=30,
+                requires_interaction=False,
+                zod_validation=self._generate_zod_validation(schema_definition),
+                extraction_hints=[]
+            )
     
     def _analyze_domain_complexity(self, domain: str) -> Dict[str, Any]:
         """Analyze complexity based on domain patterns"""
@@ -133,45 +258,42 @@ class ExtractionAnalyzer:
         reasons = []
         
         # Check for known heavy JS domains
-        for heavy_domain in self.heavy_js_domains:
+        for heavy_domain in _HEAVY_JS_DOMAINS:
             if heavy_domain in domain:
                 score += 0.8
                 reasons.append(f"Known heavy JavaScript domain: {heavy_domain}")
                 break
         
         # Social media platforms
-        social_indicators = ['facebook', 'twitter', 'instagram', 'linkedin', 'tiktok']
-        if any(indicator in domain for indicator in social_indicators):
+        if any(indicator in domain for indicator in _SOCIAL_INDICATORS):
             score += 0.7
             reasons.append("Social media platform - requires complex interaction")
         
         # E-commerce platforms
-        ecommerce_indicators = ['amazon', 'ebay', 'shopify', 'etsy', 'alibaba']
-        if any(indicator in domain for indicator in ecommerce_indicators):
+        if any(indicator in domain for indicator in _ECOMMERCE_INDICATORS):
             score += 0.5
             reasons.append("E-commerce platform - dynamic pricing and inventory")
         
         # SaaS applications
-        saas_indicators = ['app', 'dashboard', 'admin', 'portal', 'console']
-        if any(indicator in domain for indicator in saas_indicators):
+        if any(indicator in domain for indicator in _SAAS_INDICATORS):
             score += 0.6
             reasons.append("SaaS application - likely requires authentication")
         
         return {"score": min(score, 1.0), "reasons": reasons}
     
-    def _analyze_html_complexity(self, html_content: str) -> Dict[str, Any]:
+    def _analyze_html_complexity(self, html_content: str, html_lower: str) -> Dict[str, Any]:
         """Analyze HTML content for complexity indicators"""
         score = 0.0
         reasons = []
         
         # Check for JavaScript frameworks
-        for framework in self.js_frameworks:
-            if framework.lower() in html_content.lower():
+        for framework in _JS_FRAMEWORKS:
+            if framework in html_lower:
                 score += 0.3
                 reasons.append(f"JavaScript framework detected: {framework}")
         
         # Check for SPA indicators
-        for indicator in self.spa_indicators:
+        for indicator in _SPA_INDICATORS:
             if indicator in html_content:
                 score += 0.4
                 reasons.append(f"Single Page Application indicator: {indicator}")
@@ -186,13 +308,8 @@ class ExtractionAnalyzer:
             reasons.append(f"Moderate number of script tags: {script_count}")
         
         # Check for dynamic content indicators
-        dynamic_indicators = [
-            'data-bind', 'ng-', 'v-', '@click', 'onclick',
-            'data-react', 'data-vue', 'x-data', 'wire:'
-        ]
-        
-        dynamic_count = sum(1 for indicator in dynamic_indicators 
-                           if indicator in html_content.lower())
+        dynamic_count = sum(1 for indicator in _DYNAMIC_INDICATORS 
+                           if indicator in html_lower)
         
         if dynamic_count > 10:
             score += 0.4
@@ -202,14 +319,12 @@ class ExtractionAnalyzer:
             reasons.append(f"Moderate dynamic content indicators: {dynamic_count}")
         
         # Check for loading indicators
-        loading_indicators = ['loading', 'spinner', 'skeleton', 'placeholder']
-        if any(indicator in html_content.lower() for indicator in loading_indicators):
+        if any(indicator in html_lower for indicator in _LOADING_INDICATORS):
             score += 0.3
             reasons.append("Loading indicators suggest dynamic content")
         
         # Check for AJAX/fetch patterns
-        ajax_patterns = ['fetch(', 'axios', 'XMLHttpRequest', '$.ajax', '$.get', '$.post']
-        ajax_count = sum(1 for pattern in ajax_patterns if pattern in html_content)
+        ajax_count = sum(1 for pattern in _AJAX_PATTERNS if pattern in html_content)
         if ajax_count > 0:
             score += 0.4
             reasons.append(f"AJAX/fetch patterns detected: {ajax_count}")
@@ -236,24 +351,23 @@ class ExtractionAnalyzer:
             score += 0.1
             reasons.append(f"Moderate number of fields to extract: {field_count}")
         
-        # Check for complex field types
+        # Count complex field types and validation patterns in a single pass
         complex_fields = 0
-        for field_name, field_config in fields.items():
-            if isinstance(field_config, dict):
-                field_type = field_config.get("type", "string")
-                if field_type in ["array", "object"]:
-                    complex_fields += 1
-                    score += 0.2
+        pattern_fields = 0
+        for field_config in fields.values():
+            if not isinstance(field_config, dict):
+                continue
+            config_get = field_config.get
+            if config_get("type", "string") in ("array", "object"):
+                complex_fields += 1
+            if config_get("validationPattern"):
+                pattern_fields += 1
         
         if complex_fields > 0:
+            score += 0.2 * complex_fields
             reasons.append(f"Complex field types detected: {complex_fields} array/object fields")
         
         # Check for validation patterns
-        pattern_fields = 0
-        for field_name, field_config in fields.items():
-            if isinstance(field_config, dict) and field_config.get("validationPattern"):
-                pattern_fields += 1
-        
         if pattern_fields > 3:
             score += 0.1
             reasons.append(f"Multiple validation patterns: {pattern_fields}")
@@ -293,42 +407,26 @@ class ExtractionAnalyzer:
     
     def _requires_user_interaction(
         self, 
-        html_content: str, 
+        html_lower: str, 
         schema_definition: Dict[str, Any], 
         domain: str
     ) -> bool:
         """Determine if extraction requires user interaction"""
         
         # Check for authentication requirements
-        auth_indicators = [
-            'login', 'sign in', 'authenticate', 'password',
-            'data-requires-auth', 'protected', 'unauthorized'
-        ]
-        
-        if any(indicator in html_content.lower() for indicator in auth_indicators):
+        if any(indicator in html_lower for indicator in _AUTH_INDICATORS):
             return True
         
         # Check for pagination or infinite scroll
-        pagination_indicators = [
-            'load more', 'show more', 'next page', 'pagination',
-            'infinite-scroll', 'lazy-load'
-        ]
-        
-        if any(indicator in html_content.lower() for indicator in pagination_indicators):
+        if any(indicator in html_lower for indicator in _PAGINATION_INDICATORS):
             return True
         
         # Check for modal dialogs or popups
-        modal_indicators = ['modal', 'popup', 'dialog', 'overlay']
-        if any(indicator in html_content.lower() for indicator in modal_indicators):
+        if any(indicator in html_lower for indicator in _MODAL_INDICATORS):
             return True
         
         # Domain-specific interaction requirements
-        interaction_domains = [
-            'linkedin.com', 'facebook.com', 'instagram.com',
-            'twitter.com', 'discord.com', 'slack.com'
-        ]
-        
-        if any(domain_check in domain for domain_check in interaction_domains):
+        if any(domain_check in domain for domain_check in _INTERACTION_DOMAINS):
             return True
         
         return False
@@ -336,63 +434,29 @@ class ExtractionAnalyzer:
     def _generate_zod_validation(self, schema_definition: Dict[str, Any]) -> Dict[str, Any]:
         """Generate Zod validation schema from field definitions"""
         
+        # Bulk crawls reuse one schema across many URLs, so the field strings
+        # are built once per distinct schema and copied out of the cache. The
+        # key is sorted so key order does not split the cache; the output keeps
+        # the caller's field order
+        schema_key = json.dumps(schema_definition, sort_keys=True, default=str)
+        zod_fields = _build_zod_fields(schema_key)
+        
         if schema_definition.get("type") == "array":
-            fields = schema_definition.get("items", {})
+            field_names = schema_definition.get("items", {})
         else:
-            fields = schema_definition.get("properties", {})
-        
-        zod_schema = {}
-        
-        for field_name, field_config in fields.items():
-            if not isinstance(field_config, dict):
-                continue
-                
-            field_type = field_config.get("type", "string")
-            is_required = field_config.get("required", False)
-            
-            # Base Zod type
-            if field_type == "string":
-                zod_type = "z.string()"
-                
-                # Add string validations
-                if field_config.get("minLength"):
-                    zod_type += f".min({field_config['minLength']})"
-                if field_config.get("maxLength"):
-                    zod_type += f".max({field_config['maxLength']})"
-                if field_config.get("validationPattern"):
-                    pattern = field_config["validationPattern"].replace("\\", "\\\\")
-                    zod_type += f".regex(/{pattern}/)"
-                    
-            elif field_type == "number":
-                zod_type = "z.number()"
-            elif field_type == "boolean":
-                zod_type = "z.boolean()"
-            elif field_type == "array":
-                zod_type = "z.array(z.string())"  # Simplified array
-            else:
-                zod_type = "z.string()"  # Default fallback
-            
-            # Add optional/required
-            if not is_required:
-                zod_type += ".optional()"
-            
-            # Add description
-            if field_config.get("description"):
-                description = field_config["description"].replace('"', '\\"')
-                zod_type += f'.describe("{description}")'
-            
-            zod_schema[field_name] = zod_type
+            field_names = schema_definition.get("properties", {})
         
         return {
             "schema_type": schema_definition.get("type", "object"),
-            "fields": zod_schema,
+            "fields": {name: zod_fields[name] for name in field_names if name in zod_fields},
             "generated_at": datetime.utcnow().isoformat()
         }
     
     def _generate_extraction_hints(
         self, 
         schema_definition: Dict[str, Any], 
-        html_content: str
+        html_content: str,
+        html_lower: str
     ) -> List[str]:
         """Generate extraction hints based on schema and HTML analysis"""
         
@@ -402,13 +466,13 @@ class ExtractionAnalyzer:
         if '<article' in html_content:
             hints.append("Page contains <article> tags - likely news/blog content")
         
-        if 'product' in html_content.lower():
+        if 'product' in html_lower:
             hints.append("Product-related content detected - use e-commerce selectors")
         
-        if 'price' in html_content.lower():
+        if 'price' in html_lower:
             hints.append("Price information detected - look for currency symbols")
         
-        if 'rating' in html_content.lower() or '★' in html_content:
+        if 'rating' in html_lower or '★' in html_content:
             hints.append("Rating/review content detected")
         
         # Schema-based hints
@@ -428,35 +492,25 @@ class ExtractionAnalyzer:
         
         return hints
 
-    def get_extraction_method_recommendation(self, analysis: Dict[str, Any]) -> str:
+    def get_extraction_method_recommendation(self, analysis: ExtractionAnalysis) -> str:
         """Get a human-readable recommendation for extraction method"""
         
-        method = analysis.get("method", "javascript")
-        score = analysis.get("complexity_score", 0)
-        reasons = analysis.get("reasons", [])
+        method = analysis.method
+        score = analysis.complexity_score
+        reasons = analysis.reasons
+        load_time = analysis.estimated_load_time
+        requires_interaction = analysis.requires_interaction
         
         if method == "playwright":
-            return f"""
-🎭 **Playwright Recommended** (Complexity: {score:.1%})
-
-**Why Playwright?**
-{chr(10).join(f'• {reason}' for reason in reasons[:5])}
-
-**Expected Load Time:** {analysis.get('estimated_load_time', 30)} seconds
-**User Interaction Required:** {'Yes' if analysis.get('requires_interaction') else 'No'}
-
-Playwright will handle JavaScript rendering, dynamic content, and complex interactions.
-            """.strip()
+            return _PLAYWRIGHT_RECOMMENDATION.format(
+                score=score,
+                reasons=_NL.join(f"• {reason}" for reason in reasons[:5]),
+                load_time=load_time,
+                interaction='Yes' if requires_interaction else 'No'
+            )
         else:
-            return f"""
-⚡ **JavaScript Recommended** (Complexity: {score:.1%})
-
-**Why JavaScript?**
-• Simple static content extraction
-• Fast execution (estimated {analysis.get('estimated_load_time', 5)} seconds)
-• Minimal server resources required
-
-{chr(10).join(f'• {reason}' for reason in reasons[:3]) if reasons else '• Standard HTML parsing sufficient'}
-
-JavaScript extraction will be faster and more efficient for this content.
-            """.strip()
+            return _JAVASCRIPT_RECOMMENDATION.format(
+                score=score,
+                reasons=_NL.join(f"• {reason}" for reason in reasons[:3]) if reasons else '• Standard HTML parsing sufficient',
+                load_time=load_time
+            )
@@ -0,0 +1,241 @@
+"""
+HTTP Cache Service
+Records subresource responses to disk and replays them on later page visits
+"""
+
+from typing import Dict, Any, Optional, Iterable, Collection
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that vary between otherwise identical requests
+_VOLATILE_QUERY_PARAMS = frozenset({
+    "_", "ts", "timestamp", "nonce", "cb", "cachebuster",
+    "sid", "sessionid", "session_id", "phpsessid", "jsessionid"
+})
+
+# Replayed bodies are stored decoded, so encoding/length headers no longer apply
+_STRIPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+# Cache-Control directives that forbid storing a response in a shared cache
+_UNSTORABLE_DIRECTIVES = frozenset({"no-store", "private"})
+
+# Expired and over-budget entries are swept at most this often, from store()
+_PRUNE_INTERVAL_SECONDS = 300
+
+def normalize_url(url: str, ignored_params: Iterable[str] = ()) -> str:
+    """
+    Normalize a URL into a request signature by dropping the fragment, tracking
+    parameters (utm_*) and volatile query parameters
+    """
+    ignored = _VOLATILE_QUERY_PARAMS.union(param.lower() for param in ignored_params)
+    parsed = urlparse(url)
+    query = [
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in ignored
+    ]
+    return parsed._replace(query=urlencode(query), fragment="").geturl()
+
+class HttpCache:
+    """
+    Disk-backed record/replay cache for HTTP responses.
+
+    Bodies are stored gzipped under cache_dir and indexed in SQLite by
+    (method, normalized URL, request body hash). Per-domain rules may
+    disable caching, ignore extra query parameters or override the TTL:
+
+        {"example.com": {"enabled": False},
+         "shop.com": {"ignore_params": ["v"], "ttl_seconds": 600}}
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl_seconds: int,
+        resource_types: Collection[str],
+        domain_rules: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_bytes: int = 0
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.resource_types = frozenset(resource_types)
+        self.domain_rules = {domain.lower(): rule for domain, rule in (domain_rules or {}).items()}
+        self.max_bytes = max_bytes  # 0 for no size limit
+        self._last_pruned = 0.0
+
+        # The index is touched from worker threads, so serialize access to it
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cache_dir / "index.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                size INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(responses)")}
+        if "size" not in columns:
+            # Index created before size-based eviction
+            self._db.execute("ALTER TABLE responses ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+        self._db.commit()
+        self._closed = False
+
+    def _rule_for(self, url: str) -> Dict[str, Any]:
+        """Get the override rule for the URL's domain, if any"""
+        host = (urlparse(url).hostname or "").lower()
+        for domain, rule in self.domain_rules.items():
+            if host == domain or host.endswith("." + domain):
+                return rule
+        return {}
+
+    def _body_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.gz"
+
+    def is_cacheable(self, method: str, resource_type: str, url: str) -> bool:
+        """Check whether a request may be served from or recorded into the cache"""
+        if method != "GET" or resource_type not in self.resource_types:
+            return False
+        return self._rule_for(url).get("enabled", True)
+
+    def request_key(self, method: str, url: str, body: Optional[bytes] = None) -> str:
+        """Build the cache key for a request from its normalized signature"""
+        normalized = normalize_url(url, self._rule_for(url).get("ignore_params", ()))
+        body_hash = hashlib.sha256(body).hexdigest() if body else ""
+        return hashlib.sha256(f"{method} {normalized} {body_hash}".encode()).hexdigest()
+
+    async def lookup(self, key: str, url: str) -> Optional[Dict[str, Any]]:
+        """Get a fresh cached response as {"status", "headers", "body"}, or None"""
+        return await asyncio.to_thread(self._lookup_sync, key, url)
+
+    @staticmethod
+    def is_storable(headers: Dict[str, str]) -> bool:
+        """Check that the response's Cache-Control allows it to be recorded"""
+        cache_control = next(
+            (value for name, value in headers.items() if name.lower() == "cache-control"), ""
+        )
+        directives = {directive.split("=", 1)[0].strip().lower() for directive in cache_control.split(",")}
+        return directives.isdisjoint(_UNSTORABLE_DIRECTIVES)
+
+    async def store(self, key: str, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """Record a response body and its metadata, unless its Cache-Control forbids it"""
+        if not self.is_storable(headers):
+            return
+        try:
+            await asyncio.to_thread(self._store_sync, key, url, status, headers, body)
+        except Exception as e:
+            logger.warning(f"Failed to cache response for {url}: {str(e)}")
+
+    def _lookup_sync(self, key: str, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._db.execute(
+                "SELECT status, headers, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        status, headers, stored_at = row
+        if time.time() - stored_at > self._rule_for(url).get("ttl_seconds", self.ttl_seconds):
+            return None
+
+        try:
+            with gzip.open(self._body_path(key), "rb") as body_file:
+                body = body_file.read()
+        except OSError:
+            return None
+
+        return {"status": status, "headers": json.loads(headers), "body": body}
+
+    def _store_sync(self, key: str, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        # Compress into a private temp file, then swap it in under the lock so
+        # concurrent stores of one key never leave a torn body behind
+        temp_path = self.cache_dir / f"{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            with gzip.open(temp_path, "wb") as body_file:
+                body_file.write(body)
+
+            kept_headers = {
+                name: value for name, value in headers.items()
+                if name.lower() not in _STRIPPED_HEADERS
+            }
+            with self._lock:
+                if self._closed:
+                    return
+                os.replace(temp_path, self._body_path(key))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, url, status, headers, stored_at, size) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, url, status, json.dumps(kept_headers), time.time(), os.path.getsize(self._body_path(key)))
+                )
+                self._db.commit()
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        if time.monotonic() - self._last_pruned > _PRUNE_INTERVAL_SECONDS:
+            self.prune()
+
+    def prune(self) -> None:
+        """
+        Delete entries older than the longest TTL in use, then the oldest
+        entries until the bodies fit in max_bytes
+        """
+        self._last_pruned = time.monotonic()
+        max_ttl = max(
+            [self.ttl_seconds] + [rule["ttl_seconds"] for rule in self.domain_rules.values() if "ttl_seconds" in rule]
+        )
+        with self._lock:
+            if self._closed:
+                return
+            expired = [
+                row[0] for row in self._db.execute(
+                    "SELECT key FROM responses WHERE stored_at < ?", (time.time() - max_ttl,)
+                ).fetchall()
+            ]
+            evicted = []
+            if self.max_bytes:
+                cutoff = time.time() - max_ttl
+                total = self._db.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM responses WHERE stored_at >= ?", (cutoff,)
+                ).fetchone()[0]
+                if total > self.max_bytes:
+                    for key, size in self._db.execute(
+                        "SELECT key, size FROM responses WHERE stored_at >= ? ORDER BY stored_at", (cutoff,)
+                    ).fetchall():
+                        if total <= self.max_bytes:
+                            break
+                        evicted.append(key)
+                        total -= size
+
+            stale = expired + evicted
+            for key in stale:
+                self._body_path(key).unlink(missing_ok=True)
+            self._db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in stale])
+            self._db.commit()
+
+        if stale:
+            logger.info(f"Pruned {len(stale)} cached responses from {self.cache_dir}")
+
+    def close(self) -> None:
+        """Close the metadata index"""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._db.close()
@@ -1,24 +1,284 @@
-from playwright.async_api import async_playwright, Browser, Page
-from typing import Dict, Any, Optional, List
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 import asyncio
+import base64
+import copy
 import json
 import logging
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-import re
+from contextlib import asynccontextmanager
 from urllib.parse import urlparse, urljoin
 from ..core.config import settings
+from .http_cache import HttpCache, normalize_url
 
 logger = logging.getLogger(__name__)
 
+_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-accelerated-2d-canvas',
+    '--disable-gpu',
+    '--window-size=1920x1080'
+]
+
+# Set once per context rather than per page
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+_VIEWPORT = {"width": 1920, "height": 1080}
+
+# Only HTML and text are ever consumed, so lightweight pages skip these
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+_BLOCKED_HOSTS = (
+    "doubleclick.net", "google-analytics.com", "googletagmanager.com",
+    "googlesyndication.com", "facebook.net", "hotjar.com",
+    "scorecardresearch.com", "segment.io", "mixpanel.com"
+)
+
+# User-facing messages for page load failures, first matching marker wins
+_ERR_TABLE = (
+    ("Timeout", "Page took too long to load. This might be a slow website or network issue."),
+    ("net::ERR_NAME_NOT_RESOLVED", "Cannot resolve domain name. Please check if the URL is correct."),
+    ("net::ERR_CONNECTION_REFUSED", "Connection refused. The server might be down or blocking requests."),
+    ("net::ERR_CERT", "SSL certificate error. The website might have security issues."),
+    ("HTTP 4", "Page not found or access denied. Please check the URL."),
+    ("HTTP 5", "Server error. The website is experiencing technical difficulties."),
+)
+
+# Resolves once the DOM has been free of mutations for quietMs, or after timeoutMs
+_DOM_STABLE_JS = """
+    ([quietMs, timeoutMs]) => new Promise(resolve => {
+        const target = document.body || document.documentElement;
+        const finish = () => {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(deadline);
+            resolve();
+        };
+        const observer = new MutationObserver(() => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(finish, quietMs);
+        });
+        let quietTimer = setTimeout(finish, quietMs);
+        const deadline = setTimeout(finish, timeoutMs);
+        observer.observe(target, { childList: true, subtree: true, attributes: true, characterData: true });
+    })
+"""
+
+# True once common loading indicators are gone or hidden
+_LOADING_DONE_JS = """
+    () => {
+        const loadingElements = document.querySelectorAll('[class*="loading"], [class*="spinner"], [id*="loading"]');
+        return loadingElements.length === 0 || Array.from(loadingElements).every(el => 
+            el.style.display === 'none' || !el.offsetParent
+        );
+    }
+"""
+
+# Document HTML, title, metadata and dimensions in one round-trip
+_PAGE_SNAPSHOT_JS = """
+    () => {
+        const doctype = document.doctype ? new XMLSerializer().serializeToString(document.doctype) : '';
+
+        const metaDescription = document.querySelector('meta[name="description"]')?.getAttribute('content') || 
+                              document.querySelector('meta[property="og:description"]')?.getAttribute('content') || 
+                              document.querySelector('meta[name="twitter:description"]')?.getAttribute('content') || 
+                              "";
+
+        const canonicalUrl = document.querySelector('link[rel="canonical"]')?.getAttribute('href') || 
+                            document.querySelector('meta[property="og:url"]')?.getAttribute('content') || 
+                            window.location.href;
+
+        return {
+            html: doctype + document.documentElement.outerHTML,
+            title: document.title,
+            metaDescription,
+            canonicalUrl,
+            pageInfo: {
+                scrollHeight: document.body ? document.body.scrollHeight : 0,
+                clientHeight: document.documentElement.clientHeight,
+                url: window.location.href,
+                timestamp: new Date().toISOString()
+            }
+        };
+    }
+"""
+
+# Headings, links, images, articles and sections, collected in one DOM walk
+_STRUCTURE_JS = """
+    (extraAttributes) => {
+        const getElementInfo = (element) => {
+            const info = {
+                tagName: element.tagName.toLowerCase(),
+                id: element.id || null,
+                classes: Array.from(element.classList),
+                textContent: element.textContent?.slice(0, 100) || '',
+                href: element.href,
+                src: element.src,
+                alt: element.alt,
+                role: element.getAttribute('role')
+            };
+            if (extraAttributes.length) {
+                info.attributes = {};
+                for (const name of extraAttributes) {
+                    if (element.hasAttribute(name)) info.attributes[name] = element.getAttribute(name);
+                }
+            }
+            return info;
+        };
+
+        const result = {
+            title: document.title,
+            headings: [],
+            links: [],
+            images: [],
+            forms: [],
+            lists: [],
+            articles: [],
+            sections: []
+        };
+
+        // Walk the DOM once, in document order, dispatching on tag name
+        const walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_ELEMENT);
+        for (let node = walker.currentNode; node; node = walker.nextNode()) {
+            switch (node.tagName) {
+                case 'H1': case 'H2': case 'H3': case 'H4': case 'H5': case 'H6':
+                    result.headings.push(getElementInfo(node));
+                    break;
+                case 'A':
+                    if (node.hasAttribute('href')) result.links.push(getElementInfo(node));
+                    break;
+                case 'IMG':
+                    if (node.hasAttribute('src')) result.images.push(getElementInfo(node));
+                    break;
+                case 'ARTICLE':
+                    result.articles.push(getElementInfo(node));
+                    break;
+                case 'SECTION':
+                    result.sections.push(getElementInfo(node));
+                    break;
+            }
+        }
+
+        return result;
+    }
+"""
+
+# Runs an extraction script body as an async function. Results are sliced in
+# the page when a limit is given, so a test run never ships the full result set.
+# Compiling the body in-page is blocked on pages whose CSP forbids unsafe-eval;
+# _execute_script_safely falls back to _wrap_script_expression there.
+_RUN_SCRIPT_JS = """
+    async ({ script, limit }) => {
+        const AsyncFunction = Object.getPrototypeOf(async function () {}).constructor;
+        const r = await new AsyncFunction(script)();
+        if (limit === null) return r;
+        if (Array.isArray(r)) return r.slice(0, limit);
+        if (r && typeof r === 'object' && Array.isArray(r.items)) return { ...r, items: r.items.slice(0, limit) };
+        return r;
+    }
+"""
+
+# Page errors raised when the CSP blocks the AsyncFunction constructor
+_CSP_EVAL_ERRORS = ("unsafe-eval", "Content Security Policy", "EvalError")
+
+def _wrap_script_expression(script: str, limit: Optional[int]) -> str:
+    """
+    Splice a script body into a self-invoking expression. Evaluated as an
+    expression by the driver, it is not subject to the page's CSP.
+    """
+    if limit is None:
+        return f"(async () => {{ {script} }})()"
+    limit = int(limit)
+    return (
+        f"(async () => {{ const r = await (async () => {{ {script} }})(); "
+        f"return Array.isArray(r) ? r.slice(0, {limit}) "
+        f": (r && typeof r === 'object' && Array.isArray(r.items) "
+        f"? {{...r, items: r.items.slice(0, {limit})}} : r); }})()"
+    )
+
+def _is_blocked_host(url: str) -> bool:
+    """Check whether a request goes to a known analytics/ads host"""
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == blocked or host.endswith("." + blocked) for blocked in _BLOCKED_HOSTS)
+
+def _content_cache_key(url: str, lightweight: bool) -> str:
+    """Key content results by URL and whether heavy resources were blocked"""
+    return normalize_url(url) + ("|lightweight" if lightweight else "|full")
+
+def _structure_cache_key(url: str, extra_attributes: Sequence[str]) -> str:
+    """Key structure results by URL and the extra attributes they include"""
+    key = normalize_url(url)
+    if extra_attributes:
+        key += "|" + ",".join(sorted(extra_attributes))
+    return key
+
+class _ResultCache:
+    """
+    Coroutine-safe LRU cache of page results with a time-to-live
+    """
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+        
+        hit = copy.deepcopy(result)
+        hit["cache_hit"] = True
+        return hit
+    
+    async def set(self, key: str, result: Dict[str, Any]) -> None:
+        async with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
 class PlaywrightService:
-    def __init__(self):
+    # Services are created per request, so rendered results are cached at
+    # class level to survive across instances
+    _content_cache = _ResultCache(settings.page_cache_max_entries, settings.page_cache_ttl_seconds)
+    _structure_cache = _ResultCache(settings.page_cache_max_entries, settings.page_cache_ttl_seconds)
+    _http_cache: Optional[HttpCache] = None
+    
+    # Every driver start spawns a node process, so instances share one and
+    # the last to close stops it
+    _shared_playwright: Optional[Playwright] = None
+    _playwright_refcount: int = 0
+    _playwright_lock = asyncio.Lock()
+    
+    def __init__(self, playwright: Optional[Playwright] = None, persistent_profile: bool = False):
         self.browser: Optional[Browser] = None
-        self.playwright = None
+        self.browser_context: Optional[BrowserContext] = None  # Persistent profile, if used
+        self.playwright = playwright  # Caller-provided drivers are never stopped here
+        self._holds_shared_driver = False
+        # Only the long-lived shared service opts in; a profile directory can be
+        # held by one browser at a time, so short-lived instances stay ephemeral
+        self.persistent_profile = persistent_profile
         self.max_timeout = settings.job_timeout_minutes * 60 * 1000  # Convert to milliseconds
+        self.pool_size = settings.browser_context_pool_size
+        self.context_pool: Optional[asyncio.Queue] = None
+        self._page_slots: Optional[asyncio.Semaphore] = None
+        self._init_lock = asyncio.Lock()
+        self._disconnected = False
     
     async def __aenter__(self):
-        """Async context manager entry"""
-        await self.initialize()
+        """Async context manager entry; the browser is launched on the first page load"""
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -28,160 +288,350 @@ class PlaywrightService:
     async def initialize(self):
         """Initialize Playwright browser"""
         try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-accelerated-2d-canvas',
-                    '--disable-gpu',
-                    '--window-size=1920x1080'
-                ]
-            )
+            if settings.http_cache_enabled and PlaywrightService._http_cache is None:
+                PlaywrightService._http_cache = HttpCache(
+                    settings.http_cache_dir,
+                    settings.http_cache_ttl_seconds,
+                    settings.http_cache_resource_types,
+                    settings.http_cache_domain_rules,
+                    settings.http_cache_max_bytes
+                )
+            
+            if self.playwright is None:
+                self.playwright = await self._acquire_shared_driver()
+                self._holds_shared_driver = True
+            
+            contexts = None
+            if self.persistent_profile and settings.browser_user_data_dir:
+                contexts = await self._launch_persistent_context()
+            if contexts is None:
+                # Contexts are created on demand, up to pool_size, by _acquire_page
+                await self._launch_browser()
+                contexts = []
+            
+            self.context_pool = asyncio.Queue()
+            for context in contexts:
+                self.context_pool.put_nowait(context)
+            self._page_slots = asyncio.Semaphore(self.pool_size)
+            
             logger.info("Playwright browser initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Playwright: {str(e)}")
             raise
     
+    @classmethod
+    def close_http_cache(cls) -> None:
+        """Close the shared HTTP cache index (on application shutdown)"""
+        if cls._http_cache is not None:
+            cls._http_cache.close()
+            cls._http_cache = None
+    
+    @classmethod
+    async def _acquire_shared_driver(cls) -> Playwright:
+        """Start the shared Playwright driver on first use and take a reference to it"""
+        async with cls._playwright_lock:
+            if cls._shared_playwright is None:
+                cls._shared_playwright = await async_playwright().start()
+            cls._playwright_refcount += 1
+            return cls._shared_playwright
+    
+    @classmethod
+    async def _release_shared_driver(cls) -> None:
+        """Drop a reference to the shared driver, stopping it when none remain"""
+        async with cls._playwright_lock:
+            cls._playwright_refcount -= 1
+            if cls._playwright_refcount <= 0 and cls._shared_playwright is not None:
+                await cls._shared_playwright.stop()
+                cls._shared_playwright = None
+                cls._playwright_refcount = 0
+    
+    async def _launch_persistent_context(self) -> Optional[List[BrowserContext]]:
+        """
+        Launch Chromium on an on-disk profile so its HTTP cache survives restarts.
+        The profile is a single context, so every pool slot shares it and pages
+        are not isolated from each other (cookies, localStorage).
+        Each worker process uses its own directory, named by WORKER_ID.
+        Returns None if the profile cannot be used (e.g. locked by another browser).
+        """
+        user_data_dir = os.path.join(settings.browser_user_data_dir, os.getenv("WORKER_ID", "0"))
+        try:
+            os.makedirs(user_data_dir, exist_ok=True)
+            self.browser_context = await self.playwright.chromium.launch_persistent_context(
+                user_data_dir,
+                headless=True,
+                args=_LAUNCH_ARGS,
+                viewport=_VIEWPORT,
+                user_agent=_USER_AGENT
+            )
+            # Fires when the profile's browser crashes or is closed
+            self.browser_context.on("close", self._mark_disconnected)
+        except Exception as e:
+            logger.warning(f"Persistent browser profile {user_data_dir} unavailable, using an ephemeral one: {str(e)}")
+            return None
+        
+        return [self.browser_context] * self.pool_size
+    
+    async def _launch_browser(self) -> None:
+        """Launch an ephemeral browser"""
+        self.browser = await self.playwright.chromium.launch(
+            headless=True,
+            args=_LAUNCH_ARGS
+        )
+        self.browser.on("disconnected", self._mark_disconnected)
+    
+    def _mark_disconnected(self, *_args) -> None:
+        self._disconnected = True
+    
+    def is_connected(self) -> bool:
+        """
+        Check that the browser is still usable. A service that has not
+        launched yet counts as connected; it launches on first use.
+        """
+        if self._disconnected:
+            return False
+        if self.browser is not None:
+            return self.browser.is_connected()
+        return True
+    
+    async def _new_context(self) -> BrowserContext:
+        """
+        Create a pooled context with viewport and user agent set once, so later
+        URLs on it only pay for a cheap new_page()
+        """
+        return await self.browser.new_context(
+            viewport=_VIEWPORT,
+            user_agent=_USER_AGENT
+        )
+    
     async def close(self):
         """Clean up browser resources"""
         try:
+            # Closing the browser also closes every pooled context
+            if self.browser_context:
+                await self.browser_context.close()
             if self.browser:
                 await self.browser.close()
-            if self.playwright:
-                await self.playwright.stop()
             logger.info("Playwright browser closed successfully")
         except Exception as e:
+            # A crashed browser may fail to close; still drop it and the driver reference
             logger.error(f"Error closing Playwright: {str(e)}")
+        finally:
+            self.browser = None
+            self.browser_context = None
+            self.context_pool = None
+            self._page_slots = None
+            if self._holds_shared_driver:
+                self._holds_shared_driver = False
+                self.playwright = None
+                await self._release_shared_driver()
     
-    async def get_page_content(self, url: str) -> Dict[str, Any]:
+    @asynccontextmanager
+    async def _acquire_page(self, lightweight: bool = True):
         """
-        Load a webpage and return its content and metadata
+        Borrow a context from the pool and yield a fresh page on it.
+        Lightweight pages do not load images, media, fonts, stylesheets or trackers.
         """
-        if not self.browser:
-            await self.initialize()
+        if self.context_pool is None:
+            async with self._init_lock:
+                if self.context_pool is None:
+                    await self.initialize()
         
-        page = None
-        try:
-            page = await self.browser.new_page()
-            
-            # Set viewport and user agent
-            await page.set_viewport_size({"width": 1920, "height": 1080})
-            await page.set_extra_http_headers({
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            })
-            
-            # Navigate to the page with extended timeout for complex apps
-            response = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            
-            if not response or response.status >= 400:
-                raise Exception(f"Failed to load page: HTTP {response.status if response else 'No response'}")
-            
-            # Wait for content to load with multiple strategies for complex apps
+        async with self._page_slots:
+            context: Optional[BrowserContext] = None
+            page = None
             try:
-                # First, wait for network to be mostly idle (with timeout)
-                await page.wait_for_load_state("networkidle", timeout=10000)
-            except:
-                # If networkidle fails, just wait a bit for dynamic content
-                await asyncio.sleep(2)
+                try:
+                    context = self.context_pool.get_nowait()
+                except asyncio.QueueEmpty:
+                    # The slot semaphore caps how many contexts are ever created
+                    context = await self._new_context()
+                page = await context.new_page()
                 
-            # Additional wait for JavaScript-heavy applications
-            try:
-                # Wait for common loading indicators to disappear
-                await page.wait_for_function(
-                    """
-                    () => {
-                        const loadingElements = document.querySelectorAll('[class*="loading"], [class*="spinner"], [id*="loading"]');
-                        return loadingElements.length === 0 || Array.from(loadingElements).every(el => 
-                            el.style.display === 'none' || !el.offsetParent
-                        );
-                    }
-                    """,
-                    timeout=5000
-                )
-            except:
-                # If no loading indicators found or timeout, continue
-                pass
+                # Routes registered last run first: filter, then cache, then network
+                await self._enable_http_cache(page)
+                if lightweight:
+                    await page.route("**/*", self._filter_resources)
+                
+                yield page
+            finally:
+                if page:
+                    await page.close()
+                if context is not None:
+                    self.context_pool.put_nowait(context)
+    
+    async def _wait_for_dom_stable(self, page: Page, quiet_ms: int = 500, timeout_ms: int = 8000) -> None:
+        """
+        Wait until the DOM has gone quiet_ms without mutations, bounded by timeout_ms.
+        Unlike networkidle this is not held open by long-polling ads or analytics.
+        """
+        try:
+            await page.evaluate(_DOM_STABLE_JS, [quiet_ms, timeout_ms])
+        except Exception as e:
+            # A client-side navigation destroys the execution context; carry on
+            logger.debug(f"DOM stability wait interrupted: {str(e)}")
+    
+    async def _filter_resources(self, route) -> None:
+        """
+        Abort heavy resources and tracker requests that extraction never reads
+        """
+        request = route.request
+        if request.resource_type in _BLOCKED_RESOURCE_TYPES or _is_blocked_host(request.url):
+            await route.abort()
+        else:
+            await route.fallback()
+    
+    async def _enable_http_cache(self, page: Page) -> None:
+        """
+        Replay cached subresource responses on this page and record fresh ones
+        """
+        http_cache = self._http_cache
+        if http_cache is None:
+            return
+        
+        replayed = set()
+        
+        async def replay_from_cache(route):
+            request = route.request
+            if not http_cache.is_cacheable(request.method, request.resource_type, request.url):
+                await route.fallback()
+                return
+            
+            key = http_cache.request_key(request.method, request.url, request.post_data_buffer)
+            entry = await http_cache.lookup(key, request.url)
+            if entry is None:
+                await route.fallback()
+                return
+            
+            replayed.add(request)
+            await route.fulfill(status=entry["status"], headers=entry["headers"], body=entry["body"])
+        
+        async def record_response(response):
+            request = response.request
+            if request in replayed or response.status != 200:
+                return
+            if not http_cache.is_cacheable(request.method, request.resource_type, request.url):
+                return
             
-            # Get page content and metadata
-            html_content = await page.content()
-            title = await page.title()
+            try:
+                body = await response.body()
+            except Exception:
+                # Redirects and aborted requests have no body to record
+                return
             
-            # Extract metadata using JavaScript evaluation (more reliable)
-            metadata = await page.evaluate("""
-                () => {
-                    const metaDescription = document.querySelector('meta[name="description"]')?.getAttribute('content') || 
-                                          document.querySelector('meta[property="og:description"]')?.getAttribute('content') || 
-                                          document.querySelector('meta[name="twitter:description"]')?.getAttribute('content') || 
-                                          "";
-                    
-                    const canonicalUrl = document.querySelector('link[rel="canonical"]')?.getAttribute('href') || 
-                                        document.querySelector('meta[property="og:url"]')?.getAttribute('content') || 
-                                        window.location.href;
-                    
-                    return {
-                        metaDescription,
-                        canonicalUrl
-                    };
+            key = http_cache.request_key(request.method, request.url, request.post_data_buffer)
+            await http_cache.store(key, request.url, response.status, response.headers, body)
+        
+        await page.route("**/*", replay_from_cache)
+        page.on("response", record_response)
+    
+    async def get_page_content(self, url: str, lightweight: bool = True) -> Dict[str, Any]:
+        """
+        Load a webpage and return its content and metadata
+        """
+        cache_key = _content_cache_key(url, lightweight)
+        cached = await self._content_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            async with self._acquire_page(lightweight) as page:
+                # Navigate to the page with extended timeout for complex apps
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+
+                if not response or response.status >= 400:
+                    raise Exception(f"Failed to load page: HTTP {response.status if response else 'No response'}")
+
+                # Wait for content to load with multiple strategies for complex apps
+                await self._wait_for_dom_stable(page)
+
+                # Additional wait for JavaScript-heavy applications
+                try:
+                    # Wait for common loading indicators to disappear
+                    await page.wait_for_function(
+                        _LOADING_DONE_JS,
+                        timeout=5000
+                    )
+                except:
+                    # If no loading indicators found or timeout, continue
+                    pass
+
+                # Read content, title, metadata and dimensions in a single round-trip
+                snapshot = await page.evaluate(_PAGE_SNAPSHOT_JS)
+
+                html_content = snapshot["html"]
+                title = snapshot["title"]
+                meta_description = snapshot.get('metaDescription', '')
+                canonical_url = snapshot.get('canonicalUrl', url)
+                page_info = snapshot["pageInfo"]
+
+                result = {
+                    "url": url,
+                    "final_url": page_info["url"],
+                    "title": title,
+                    "html_content": html_content,
+                    "meta_description": meta_description,
+                    "canonical_url": canonical_url,
+                    "page_info": page_info,
+                    "status": "success"
                 }
-            """)
-            
-            meta_description = metadata.get('metaDescription', '')
-            canonical_url = metadata.get('canonicalUrl', url)
-            
-            # Get page dimensions and scroll height
-            page_info = await page.evaluate("""
-                () => ({
-                    scrollHeight: document.body.scrollHeight,
-                    clientHeight: document.documentElement.clientHeight,
-                    url: window.location.href,
-                    timestamp: new Date().toISOString()
-                })
-            """)
-            
-            return {
-                "url": url,
-                "final_url": page_info["url"],
-                "title": title,
-                "html_content": html_content,
-                "meta_description": meta_description,
-                "canonical_url": canonical_url,
-                "page_info": page_info,
-                "status": "success"
-            }
-            
+                await self._content_cache.set(cache_key, result)
+                return result
+
         except Exception as e:
             error_message = str(e)
             logger.error(f"Error loading page {url}: {error_message}")
             
             # Provide more user-friendly error messages
-            if "Timeout" in error_message:
-                if "30000ms" in error_message or "timeout" in error_message.lower():
-                    error_message = "Page took too long to load. This might be a slow website or network issue."
-                else:
-                    error_message = f"Timeout while loading page: {error_message}"
-            elif "net::ERR_NAME_NOT_RESOLVED" in error_message:
-                error_message = "Cannot resolve domain name. Please check if the URL is correct."
-            elif "net::ERR_CONNECTION_REFUSED" in error_message:
-                error_message = "Connection refused. The server might be down or blocking requests."
-            elif "net::ERR_CERT" in error_message:
-                error_message = "SSL certificate error. The website might have security issues."
-            elif "HTTP 4" in error_message:
-                error_message = "Page not found or access denied. Please check the URL."
-            elif "HTTP 5" in error_message:
-                error_message = "Server error. The website is experiencing technical difficulties."
+            for marker, friendly_message in _ERR_TABLE:
+                if marker in error_message:
+                    error_message = friendly_message
+                    break
             
             return {
                 "url": url,
                 "error": error_message,
                 "status": "error"
             }
-        finally:
-            if page:
-                await page.close()
-    
+
+    async def get_many_page_contents(
+        self,
+        urls: List[str],
+        concurrency: int = 8,
+        lightweight: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Load several pages concurrently on the shared browser.
+        Results are returned in the same order as urls.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_page_content(url, lightweight=lightweight)
+
+        results = await asyncio.gather(*(load(url) for url in urls), return_exceptions=True)
+
+        return [
+            {"url": url, "error": str(result), "status": "error"}
+            if isinstance(result, BaseException) else result
+            for url, result in zip(urls, results)
+        ]
+
+    def open_page(
+        self,
+        url: str,
+        lightweight: bool = True,
+        timeout: Optional[float] = None
+    ) -> "_PageHandle":
+        """
+        Load a page once and keep it open for several operations:
+
+            async with service.open_page(url) as handle:
+                structure = await handle.analyze()
+                raw_data = await handle.extract(script)
+        """
+        return _PageHandle(self, url, lightweight=lightweight, timeout=timeout)
+
     async def execute_extraction_script(
         self,
         url: str,
@@ -191,45 +641,24 @@ class PlaywrightService:
         """
         Execute a generated Playwright script to extract data
         """
-        if not self.browser:
-            await self.initialize()
-        
-        page = None
         try:
-            page = await self.browser.new_page()
-            
-            # Set viewport and user agent
-            await page.set_viewport_size({"width": 1920, "height": 1080})
-            await page.set_extra_http_headers({
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            })
-            
-            # Navigate to the page with extended timeout for complex apps
-            response = await page.goto(url, wait_until="domcontentloaded", timeout=90000)
-            
-            # Wait for content to load with multiple strategies
-            try:
-                await page.wait_for_load_state("networkidle", timeout=15000)
-            except:
-                # Fallback wait for complex apps
-                await asyncio.sleep(3)
-            
-            if not response or response.status >= 400:
-                raise Exception(f"Failed to load page: HTTP {response.status if response else 'No response'}")
-            
-            # Execute the extraction script
-            extracted_data = await self._execute_script_safely(page, script_content)
-            
-            # Validate and clean the extracted data
-            cleaned_data = self._clean_extracted_data(extracted_data, schema_definition)
-            
+            # Extended timeout for complex apps
+            async with self.open_page(url, timeout=90000) as handle:
+                extracted_data = await handle.extract(script_content)
+
+            # Validate and clean the extracted data off the event loop, after
+            # the page and its pooled context have been released
+            cleaned_data, data_count = await asyncio.to_thread(
+                self._clean_extracted_data, extracted_data, schema_definition
+            )
+
             return {
                 "status": "success",
                 "data": cleaned_data,
-                "data_count": self._count_extracted_items(cleaned_data),
+                "data_count": data_count,
                 "extracted_at": datetime.utcnow().isoformat()
             }
-            
+
         except Exception as e:
             logger.error(f"Error executing extraction script for {url}: {str(e)}")
             return {
@@ -239,13 +668,12 @@ class PlaywrightService:
                 "data_count": 0,
                 "extracted_at": datetime.utcnow().isoformat()
             }
-        finally:
-            if page:
-                await page.close()
     
-    async def _execute_script_safely(self, page: Page, script_content: str) -> Any:
+    async def _execute_script_safely(self, page: Page, script_content: str, limit: Optional[int] = None) -> Any:
         """
-        Safely execute the extraction script with timeout and error handling
+        Safely execute the extraction script with timeout and error handling.
+        When limit is given, array results (or an {items: [...]} result's items)
+        are sliced before leaving the browser.
         """
         try:
             # Clean the script content first
@@ -259,44 +687,55 @@ class PlaywrightService:
                 if start != -1 and end != -1:
                     cleaned_script = cleaned_script[start+1:end].strip()
             
-            # Execute the script directly without wrapping
-            result = await asyncio.wait_for(
-                page.evaluate(f"(() => {{ {cleaned_script} }})()"),
-                timeout=60.0  # 60 second timeout for script execution
-            )
+            try:
+                result = await asyncio.wait_for(
+                    page.evaluate(_RUN_SCRIPT_JS, {"script": cleaned_script, "limit": limit}),
+                    timeout=60.0  # 60 second timeout for script execution
+                )
+            except Exception as e:
+                if not any(marker in str(e) for marker in _CSP_EVAL_ERRORS):
+                    raise
+                # The page's CSP blocks in-page compilation, so splice the script
+                # into the expression instead of disabling CSP for every context
+                result = await asyncio.wait_for(
+                    page.evaluate(_wrap_script_expression(cleaned_script, limit)),
+                    timeout=60.0
+                )
             return result
             
         except Exception as e:
             logger.error(f"Script execution failed: {str(e)}")
             raise Exception(f"Script execution failed: {str(e)}")
     
-    def _clean_extracted_data(self, data: Any, schema: Dict[str, Any]) -> Any:
+    def _clean_extracted_data(self, data: Any, schema: Dict[str, Any]) -> Tuple[Any, int]:
         """
-        Clean and validate extracted data according to schema
+        Clean and validate extracted data according to schema.
+        Returns the cleaned data together with its item count.
         """
-        if not data or isinstance(data, dict) and "error" in data:
-            return data
+        data_type = type(data)
         
         try:
             # If data is a list, clean each item
-            if isinstance(data, list):
+            if data_type is list:
                 cleaned_items = []
+                append = cleaned_items.append
+                clean_item = self._clean_data_item
                 for item in data:
-                    cleaned_item = self._clean_data_item(item)
-                    if cleaned_item:  # Only add non-empty items
-                        cleaned_items.append(cleaned_item)
-                return cleaned_items
+                    cleaned_item = clean_item(item)
+                    if cleaned_item:  # Only keep non-empty items
+                        append(cleaned_item)
+                return cleaned_items, len(cleaned_items)
             
             # If data is a single item, clean it
-            elif isinstance(data, dict):
-                return self._clean_data_item(data)
-            
-            # Return as-is if not dict or list
-            return data
+            if data_type is dict and data and "error" not in data:
+                cleaned_item = self._clean_data_item(data)
+                return cleaned_item, 1 if cleaned_item else 0
             
         except Exception as e:
             logger.error(f"Error cleaning extracted data: {str(e)}")
-            return data
+        
+        # Return as-is if empty, an error or not dict or list
+        return data, self._count_extracted_items(data)
     
     def _clean_data_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -311,9 +750,8 @@ class PlaywrightService:
             if value is not None:
                 # Clean string values
                 if isinstance(value, str):
-                    cleaned_value = value.strip()
-                    # Remove extra whitespace
-                    cleaned_value = re.sub(r'\s+', ' ', cleaned_value)
+                    # Strip and collapse whitespace in one pass
+                    cleaned_value = " ".join(value.split())
                     if cleaned_value:  # Only add non-empty strings
                         cleaned_item[key] = cleaned_value
                 
@@ -349,31 +787,10 @@ class PlaywrightService:
         """
         Test an extraction script with limited results for validation
         """
-        if not self.browser:
-            await self.initialize()
-        
-        page = None
         try:
-            page = await self.browser.new_page()
-            
-            # Set viewport and user agent
-            await page.set_viewport_size({"width": 1920, "height": 1080})
-            
-            # Navigate to the page
-            await page.goto(url, wait_until="networkidle", timeout=20000)
-            
-            # Modify script to limit results for testing
-            limited_script = self._limit_script_results(script_content, limit_items)
-            
-            # Execute the test script
-            test_result = await self._execute_script_safely(page, limited_script)
-            
-            return {
-                "status": "success",
-                "test_data": test_result,
-                "item_count": self._count_extracted_items(test_result)
-            }
-            
+            async with self.open_page(url, timeout=20000) as handle:
+                return await handle.test(script_content, limit_items)
+
         except Exception as e:
             return {
                 "status": "error",
@@ -381,135 +798,128 @@ class PlaywrightService:
                 "test_data": None,
                 "item_count": 0
             }
-        finally:
-            if page:
-                await page.close()
     
-    def _limit_script_results(self, script: str, limit: int) -> str:
-        """
-        Modify script to return limited results for testing
-        """
-        # Add a slice operation to limit results
-        # This is a simple approach - could be more sophisticated
-        if "return" in script and "[" in script:
-            # Try to add .slice(0, limit) to array results
-            script = re.sub(
-                r'return\s+([^;]+);',
-                f'return (\\1).slice(0, {limit});',
-                script
-            )
-        
-        return script
-    
-    async def get_page_screenshots(self, url: str) -> Dict[str, Any]:
+    async def get_page_screenshots(self, url: str, preview: bool = False) -> Dict[str, Any]:
         """
-        Take screenshots of the page for debugging/preview purposes
+        Take screenshots of the page for debugging/preview purposes.
+        Previews are taken as JPEG, which is much smaller than PNG.
         """
-        if not self.browser:
-            await self.initialize()
-        
-        page = None
         try:
-            page = await self.browser.new_page()
-            await page.set_viewport_size({"width": 1920, "height": 1080})
-            
-            await page.goto(url, wait_until="networkidle")
-            
-            # Take full page screenshot
-            screenshot_buffer = await page.screenshot(full_page=True)
-            
-            # Convert to base64 for easy transport
-            import base64
-            screenshot_base64 = base64.b64encode(screenshot_buffer).decode()
-            
+            # Screenshots need images, fonts and styles to render faithfully
+            async with self.open_page(url, lightweight=False) as handle:
+                screenshot_buffer, image_format = await handle.screenshot(preview=preview)
+
+            # Convert to base64 for easy transport, off the event loop since
+            # full page captures are often several MB, and after the page and
+            # its pooled context have been released
+            screenshot_base64 = await asyncio.to_thread(
+                lambda buffer: base64.b64encode(buffer).decode('ascii'), screenshot_buffer
+            )
+
             return {
                 "status": "success",
                 "screenshot": screenshot_base64,
-                "format": "png"
+                "format": image_format
             }
-            
+
         except Exception as e:
             return {
                 "status": "error",
                 "error": str(e)
             }
-        finally:
-            if page:
-                await page.close()
     
-    async def analyze_page_structure(self, url: str) -> Dict[str, Any]:
+    async def analyze_page_structure(self, url: str, extra_attributes: Sequence[str] = ()) -> Dict[str, Any]:
         """
         Analyze page structure to help with selector generation
         """
-        if not self.browser:
-            await self.initialize()
+        cached = await self._structure_cache.get(_structure_cache_key(url, extra_attributes))
+        if cached is not None:
+            return cached
         
-        page = None
         try:
-            page = await self.browser.new_page()
-            await page.goto(url, wait_until="networkidle")
-            
-            # Get structural information
-            structure_info = await page.evaluate("""
-                () => {
-                    const getElementInfo = (element) => {
-                        return {
-                            tagName: element.tagName.toLowerCase(),
-                            id: element.id || null,
-                            classes: Array.from(element.classList),
-                            textContent: element.textContent?.substring(0, 100) || '',
-                            attributes: Array.from(element.attributes).reduce((acc, attr) => {
-                                acc[attr.name] = attr.value;
-                                return acc;
-                            }, {})
-                        };
-                    };
-                    
-                    const result = {
-                        title: document.title,
-                        headings: [],
-                        links: [],
-                        images: [],
-                        forms: [],
-                        lists: [],
-                        articles: [],
-                        sections: []
-                    };
-                    
-                    // Collect headings
-                    document.querySelectorAll('h1, h2, h3, h4, h5, h6').forEach(h => {
-                        result.headings.push(getElementInfo(h));
-                    });
-                    
-                    // Collect links
-                    document.querySelectorAll('a[href]').forEach(a => {
-                        result.links.push(getElementInfo(a));
-                    });
-                    
-                    // Collect images
-                    document.querySelectorAll('img[src]').forEach(img => {
-                        result.images.push(getElementInfo(img));
-                    });
-                    
-                    // Collect articles and sections
-                    document.querySelectorAll('article, section').forEach(el => {
-                        result[el.tagName.toLowerCase() + 's'].push(getElementInfo(el));
-                    });
-                    
-                    return result;
-                }
-            """)
-            
-            return {
-                "status": "success",
-                "structure": structure_info
-            }
-            
+            async with self.open_page(url) as handle:
+                return await handle.analyze(extra_attributes)
+
         except Exception as e:
             return {
                 "status": "error",
                 "error": str(e)
             }
-        finally:
-            if page:
-                await page.close()
+
+
+class _PageHandle:
+    """
+    A page navigated once and shared by several service operations.
+    The page and its pooled context are released on exit.
+    """
+
+    def __init__(self, service: PlaywrightService, url: str, lightweight: bool = True, timeout: Optional[float] = None):
+        self._service = service
+        self.url = url
+        self._lightweight = lightweight
+        self._timeout = timeout
+        self._page_manager = None
+        self.page: Optional[Page] = None
+        self.response = None
+
+    async def __aenter__(self):
+        self._page_manager = self._service._acquire_page(lightweight=self._lightweight)
+        self.page = await self._page_manager.__aenter__()
+        try:
+            goto_options = {"wait_until": "domcontentloaded"}
+            if self._timeout is not None:
+                goto_options["timeout"] = self._timeout
+            self.response = await self.page.goto(self.url, **goto_options)
+
+            # Wait for content to settle
+            await self._service._wait_for_dom_stable(self.page)
+        except BaseException as e:
+            await self._page_manager.__aexit__(type(e), e, e.__traceback__)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return await self._page_manager.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def extract(self, script_content: str) -> Any:
+        """
+        Run an extraction script and return its raw result; callers clean it
+        once the page has been released
+        """
+        if not self.response or self.response.status >= 400:
+            raise Exception(f"Failed to load page: HTTP {self.response.status if self.response else 'No response'}")
+
+        return await self._service._execute_script_safely(self.page, script_content)
+
+    async def test(self, script_content: str, limit_items: int = 3) -> Dict[str, Any]:
+        """Run an extraction script, limiting results inside the browser"""
+        test_result = await self._service._execute_script_safely(self.page, script_content, limit=limit_items)
+
+        return {
+            "status": "success",
+            "test_data": test_result,
+            "item_count": self._service._count_extracted_items(test_result)
+        }
+
+    async def screenshot(self, preview: bool = False) -> Tuple[bytes, str]:
+        """
+        Take a full page screenshot, as JPEG for previews and PNG otherwise.
+        Returns the raw image buffer and its format.
+        """
+        if preview:
+            return await self.page.screenshot(full_page=True, type="jpeg", quality=80), "jpeg"
+        return await self.page.screenshot(full_page=True), "png"
+
+    async def analyze(self, extra_attributes: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        Collect structural information to help with selector generation.
+        Only a few common attributes are reported unless more are named in extra_attributes.
+        """
+        structure_info = await self.page.evaluate(_STRUCTURE_JS, list(extra_attributes))
+
+        result = {
+            "status": "success",
+            "structure": structure_info
+        }
+        await self._service._structure_cache.set(_structure_cache_key(self.url, extra_attributes), result)
+        return result
@@ -1,27 +1,171 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Tuple
 import uuid
 import asyncio
+import hashlib
 import logging
+import random
+import time
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, delete, text, true, bindparam, lambda_stmt, tuple_, DateTime
+from sqlalchemy.orm import joinedload, aliased
+from pydantic import TypeAdapter
 
 from ..models.scraping import (
     ScrapingJob, GeneratedScript, ExtractedData, ScriptTemplate,
-    ScrapingJobCreate, ScrapingJobResponse
+    ScrapingJobCreate, ScrapingJobResponse, GUID
 )
-from ..core.database import get_db
+from ..core.database import get_db, AsyncSessionLocal
+from ..core.config import settings
 from .ai_service import AIService
 from ..api.websocket import manager as connection_manager
 from .playwright_service import PlaywrightService
 
 logger = logging.getLogger(__name__)
 
+class ScrapingServiceError(Exception):
+    """Raised when a scraping service operation fails; chained to the original error"""
+
+# Broadcasts queued within this window (plus jitter, to de-synchronize
+# workers) go out together in one WebSocket frame of at most this many events
+_BROADCAST_WINDOW_SECONDS = 0.01
+_BROADCAST_JITTER_SECONDS = 0.002
+_BROADCAST_BATCH_SIZE = 128
+
+# Built once so listings validate every row with a single compiled validator
+_job_list_adapter = TypeAdapter(List[ScrapingJobResponse])
+
+# Hot lookups as cached lambda statements, so each query shape is compiled once
+_JOB_BY_ID_STMT = lambda_stmt(
+    lambda: select(ScrapingJob).where(ScrapingJob.id == bindparam("job_id"))
+)
+# A job has only a handful of scripts/extractions, so one LEFT JOIN round-trip
+# beats the extra IN-list queries of selectinload
+_JOB_WITH_CHILDREN_STMT = lambda_stmt(
+    lambda: select(ScrapingJob)
+    .options(
+        joinedload(ScrapingJob.scripts),
+        joinedload(ScrapingJob.extracted_data)
+    )
+    .where(ScrapingJob.id == bindparam("job_id"))
+)
+_USER_JOBS_STMT = lambda_stmt(
+    lambda: select(ScrapingJob)
+    .where(ScrapingJob.user_id == bindparam("user_id"))
+    .order_by(ScrapingJob.created_at.desc(), ScrapingJob.id.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+# Keyset page: jobs strictly after the (created_at, id) of the previous page's last row
+_USER_JOBS_AFTER_STMT = lambda_stmt(
+    lambda: select(ScrapingJob)
+    .where(
+        ScrapingJob.user_id == bindparam("user_id"),
+        tuple_(ScrapingJob.created_at, ScrapingJob.id) < tuple_(
+            bindparam("cursor_created_at", type_=DateTime(timezone=True)),
+            bindparam("cursor_id", type_=GUID())
+        )
+    )
+    .order_by(ScrapingJob.created_at.desc(), ScrapingJob.id.desc())
+    .limit(bindparam("limit"))
+)
+
+# Builds the job results payload inside PostgreSQL so large extractions are
+# returned as JSON text without being decoded and re-encoded in Python
+_JOB_RESULTS_JSON_SQL = text("""
+    SELECT (CASE
+        WHEN j.status <> 'completed' THEN jsonb_build_object(
+            'status', j.status,
+            'message', 'Job is in ' || j.status || ' status',
+            'data', NULL
+        )
+        WHEN d.data IS NULL THEN jsonb_build_object(
+            'status', 'completed',
+            'message', 'No data extracted',
+            'data', NULL
+        )
+        ELSE jsonb_build_object(
+            'status', 'completed',
+            'job_id', j.id::text,
+            'url', j.url,
+            'data', d.data,
+            'data_count', d.data_count,
+            'extracted_at', d.extracted_at,
+            'schema_definition', j.schema_definition
+        )
+    END)::text
+    FROM scraping_jobs j
+    LEFT JOIN LATERAL (
+        SELECT data, data_count, extracted_at
+        FROM extracted_data
+        WHERE job_id = j.id
+        ORDER BY extracted_at DESC
+        LIMIT 1
+    ) d ON true
+    WHERE j.id = :job_id
+""")
+
+# Job overviews are polled by the UI; briefly reuse them between polls
+_OVERVIEW_TTL_SECONDS = 0.2
+_OVERVIEW_CACHE_MAX_ENTRIES = 1024
+
+# Schema suggestions cost a page load and an LLM call; reuse recent ones per URL
+_SUGGEST_TTL_SECONDS = 300
+_SUGGEST_CACHE_MAX_ENTRIES = 256
+
+# Envelope type for each kind of queued broadcast. Queued events use short
+# keys (t=kind, j=job id, s=stage/status, m=message, e=error, ts=epoch ms)
+_BATCH_TYPES = {
+    "p": "job_progress_batch",
+    "u": "job_status_batch"
+}
+
 class ScrapingService:
     def __init__(self):
         self.ai_service = AIService()
         self.active_jobs: Dict[uuid.UUID, asyncio.Task] = {}
+        # Bound whole jobs, and separately the LLM calls and page loads they make
+        self._job_slots = asyncio.Semaphore(settings.max_concurrent_jobs)
+        self._llm_slots = asyncio.Semaphore(settings.llm_concurrency)
+        self._browser_slots = asyncio.Semaphore(settings.browser_concurrency)
+        self._outbox: asyncio.Queue = asyncio.Queue()
+        self._broadcaster: Optional[asyncio.Task] = None
+        # In-flight sends; the event loop only keeps weak references to tasks
+        self._broadcast_tasks: Set[asyncio.Task] = set()
+        self._overview_cache: Dict[uuid.UUID, Tuple[float, Dict[str, Any]]] = {}
+        self._suggest_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._suggest_inflight: Dict[str, asyncio.Future] = {}
+        # One browser shared by every job; each extraction only borrows a pooled context
+        self._playwright_service: Optional[PlaywrightService] = None
+        self._playwright_lock = asyncio.Lock()
+    
+    async def _ensure_playwright(self) -> PlaywrightService:
+        """Launch the shared browser on first use, and again if it has crashed or disconnected"""
+        playwright_service = self._playwright_service
+        if playwright_service is not None and playwright_service.is_connected():
+            return playwright_service
+        
+        async with self._playwright_lock:
+            playwright_service = self._playwright_service
+            if playwright_service is not None and not playwright_service.is_connected():
+                logger.warning("Shared browser disconnected, relaunching it")
+                self._playwright_service = None
+                await playwright_service.close()
+            
+            if self._playwright_service is None:
+                playwright_service = PlaywrightService(persistent_profile=True)
+                await playwright_service.initialize()
+                self._playwright_service = playwright_service
+        return self._playwright_service
+    
+    async def close(self):
+        """Shut down the shared browser and stop broadcasting"""
+        if self._broadcaster is not None:
+            self._broadcaster.cancel()
+            self._broadcaster = None
+        if self._playwright_service is not None:
+            await self._playwright_service.close()
+            self._playwright_service = None
     
     async def create_scraping_job(
         self,
@@ -47,12 +191,12 @@ class ScrapingService:
             
             logger.info(f"Created scraping job {job.id} for URL: {job.url}")
             
-            return ScrapingJobResponse.from_orm(job)
+            return ScrapingJobResponse.model_validate(job, from_attributes=True)
             
         except Exception as e:
             await db.rollback()
-            logger.error(f"Failed to create scraping job: {str(e)}")
-            raise Exception(f"Failed to create scraping job: {str(e)}")
+            logger.exception("Failed to create scraping job")
+            raise ScrapingServiceError(f"Failed to create scraping job: {str(e)}") from e
     
     async def start_scraping_job_background(
         self,
@@ -61,8 +205,6 @@ class ScrapingService:
         """
         Start executing a scraping job asynchronously with its own database session
         """
-        from ..core.database import AsyncSessionLocal
-        
         async with AsyncSessionLocal() as db:
             try:
                 await self.start_scraping_job(job_id, db)
@@ -83,20 +225,20 @@ class ScrapingService:
         Start executing a scraping job asynchronously
         """
         try:
-            # Get job from database
+            # Claim the job atomically: only a pending job moves to running
             result = await db.execute(
-                select(ScrapingJob).where(ScrapingJob.id == job_id)
+                update(ScrapingJob)
+                .where(ScrapingJob.id == job_id, ScrapingJob.status == "pending")
+                .values(status="running")
+                .returning(ScrapingJob.url, ScrapingJob.schema_definition)
             )
-            job = result.scalar_one_or_none()
+            job = result.first()
             
             if not job:
-                raise Exception(f"Job {job_id} not found")
-            
-            if job.status != "pending":
-                raise Exception(f"Job {job_id} is not in pending status")
+                raise ScrapingServiceError(f"Job {job_id} not found or not in pending status")
             
-            # Update job status to running
-            await self._update_job_status(job_id, "running", db)
+            await db.commit()
+            self._queue_status_update(job_id, "running")
             
             # Start the scraping task asynchronously
             task = asyncio.create_task(
@@ -104,6 +246,7 @@ class ScrapingService:
             )
             
             self.active_jobs[job_id] = task
+            task.add_done_callback(lambda _: self.active_jobs.pop(job_id, None))
             
             logger.info(f"Started scraping job {job_id}")
             
@@ -114,8 +257,8 @@ class ScrapingService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to start scraping job {job_id}: {str(e)}")
-            raise Exception(f"Failed to start scraping job: {str(e)}")
+            logger.exception(f"Failed to start scraping job {job_id}")
+            raise ScrapingServiceError(f"Failed to start scraping job: {str(e)}") from e
     
     async def _execute_scraping_job(
         self,
@@ -124,173 +267,151 @@ class ScrapingService:
         schema_definition: Dict[str, Any]
     ):
         """Execute scraping job with comprehensive logging and real-time updates"""
-        async with AsyncSessionLocal() as db:
-            try:
-                # Log: Job started
-                await self._log_job_progress(job_id, "started", "Initializing scraping job", db)
-                
-                # Log: Generating script
-                await self._log_job_progress(job_id, "generating_script", "AI is generating extraction script", db)
-                
-                # Generate script using AI
-                script_result = await self.ai_service.analyze_webpage_and_generate_script(url, schema_definition)
-                
-                if script_result.get("status") != "success":
-                    raise Exception(f"Script generation failed: {script_result.get('error', 'Unknown error')}")
-                
-                # Log: Script generated
-                await self._log_job_progress(job_id, "script_ready", f"Generated {len(script_result['script'])} character script", db)
-                
-                # Save generated script
-                script = GeneratedScript(
-                    job_id=job_id,
-                    script_content=script_result["script"],
-                    script_type="playwright"
-                )
-                db.add(script)
-                await db.commit()
-                
-                # Log: Starting extraction
-                await self._log_job_progress(job_id, "extracting", "Executing script and extracting data", db)
-                
-                # Execute extraction
-                async with PlaywrightService() as playwright_service:
-                    extraction_result = await playwright_service.execute_extraction_script(
-                        url, script_result["script"], schema_definition
-                    )
-                
-                if extraction_result["status"] != "success":
-                    raise Exception(f"Extraction failed: {extraction_result.get('error', 'Unknown error')}")
-                
-                # Log: Data extracted
-                data_count = extraction_result.get("data_count", 0)
-                await self._log_job_progress(job_id, "data_extracted", f"Successfully extracted {data_count} items", db)
-                
-                # Save extracted data
-                extracted_data = ExtractedData(
-                    job_id=job_id,
-                    data=extraction_result["data"],
-                    data_count=data_count
-                )
-                db.add(extracted_data)
-                await db.commit()
-                
-                # Log: Job completed
-                await self._log_job_progress(job_id, "completed", f"Job completed successfully with {data_count} items", db)
-                await self._update_job_status(job_id, "completed", db)
-                
-                logger.info(f"Scraping job {job_id} completed successfully with {data_count} items")
-                
-            except Exception as e:
-                error_message = str(e)
-                logger.error(f"Scraping job {job_id} failed: {error_message}")
-                
-                # Log: Job failed
-                await self._log_job_progress(job_id, "failed", f"Job failed: {error_message}", db)
-                await self._update_job_status(job_id, "failed", db, error_message)
-                
-            finally:
-                # Remove from active jobs
-                if job_id in self.active_jobs:
-                    del self.active_jobs[job_id]
-
-    async def _log_job_progress(
-        self,
-        job_id: uuid.UUID,
-        stage: str,
-        message: str,
-        db: AsyncSession
-    ):
-        """Log job progress and broadcast real-time update"""
-        timestamp = datetime.utcnow()
-        
-        # Broadcast real-time progress update
-        try:
-            await connection_manager.broadcast_to_all({
-                "type": "job_progress",
-                "job_id": str(job_id),
-                "stage": stage,
-                "message": message,
-                "timestamp": timestamp.isoformat()
-            })
-        except Exception as e:
-            logger.error(f"Failed to broadcast progress update: {str(e)}")
-        
-        # Log to application logs
-        logger.info(f"Job {job_id} [{stage}]: {message}")
-
-    async def _execute_scraping_job_old(
-        self,
-        job_id: uuid.UUID,
-        url: str,
-        schema_definition: Dict[str, Any]
-    ):
-        """
-        Execute the complete scraping workflow
-        """
-        async with AsyncSessionLocal() as db:
-            try:
-                logger.info(f"Executing scraping job {job_id} for URL: {url}")
-                
-                # Step 1: Load webpage content
-                async with PlaywrightService() as playwright_service:
-                    page_content = await playwright_service.get_page_content(url)
+        # Jobs over capacity wait here before taking a database session
+        async with self._job_slots:
+            async with AsyncSessionLocal() as db:
+                try:
+                    # Log: Job started
+                    await self._log_job_progress(job_id, "started", "Initializing scraping job", db)
                     
-                    if page_content["status"] == "error":
-                        raise Exception(f"Failed to load webpage: {page_content['error']}")
+                    # Log: Generating script
+                    await self._log_job_progress(job_id, "generating_script", "AI is generating extraction script", db)
                     
-                    # Step 2: Generate extraction script using AI
-                    script_content = await self.ai_service.analyze_webpage_and_generate_script(
-                        page_content["html_content"],
-                        url,
-                        schema_definition
-                    )
+                    # Generate script using AI
+                    async with self._llm_slots:
+                        script_result = await self.ai_service.analyze_webpage_and_generate_script(url, schema_definition)
+                    
+                    if script_result.get("status") != "success":
+                        raise ScrapingServiceError(f"Script generation failed: {script_result.get('error', 'Unknown error')}")
+                    
+                    # Log: Script generated
+                    await self._log_job_progress(job_id, "script_ready", f"Generated {len(script_result['script'])} character script", db)
                     
-                    # Step 3: Save generated script
-                    script_record = GeneratedScript(
+                    # Save generated script
+                    script = GeneratedScript(
                         job_id=job_id,
-                        script_content=script_content,
+                        script_content=script_result["script"],
                         script_type="playwright"
                     )
-                    db.add(script_record)
+                    db.add(script)
                     await db.commit()
                     
-                    # Step 4: Execute extraction script
-                    extraction_result = await playwright_service.execute_extraction_script(
-                        url,
-                        script_content,
-                        schema_definition
-                    )
+                    # Log: Starting extraction
+                    await self._log_job_progress(job_id, "extracting", "Executing script and extracting data", db)
+                    
+                    # Execute extraction
+                    playwright_service = await self._ensure_playwright()
+                    async with self._browser_slots:
+                        extraction_result = await playwright_service.execute_extraction_script(
+                            url, script_result["script"], schema_definition
+                        )
                     
-                    if extraction_result["status"] == "error":
-                        raise Exception(f"Extraction failed: {extraction_result['error']}")
+                    if extraction_result["status"] != "success":
+                        raise ScrapingServiceError(f"Extraction failed: {extraction_result.get('error', 'Unknown error')}")
                     
-                    # Step 5: Save extracted data
-                    extracted_data_record = ExtractedData(
+                    # Log: Data extracted
+                    data_count = extraction_result.get("data_count", 0)
+                    await self._log_job_progress(job_id, "data_extracted", f"Successfully extracted {data_count} items", db)
+                    
+                    # Save extracted data and mark the job completed in one commit
+                    extracted_data = ExtractedData(
                         job_id=job_id,
                         data=extraction_result["data"],
-                        data_count=extraction_result["data_count"]
+                        data_count=data_count
                     )
-                    db.add(extracted_data_record)
-                    
-                    # Step 6: Update job status to completed
-                    await self._update_job_status(job_id, "completed", db)
+                    db.add(extracted_data)
+                    await self._update_job_status(job_id, "completed", db, commit=False)
                     await db.commit()
                     
-                    logger.info(f"Successfully completed scraping job {job_id}")
+                    # Log: Job completed
+                    await self._log_job_progress(job_id, "completed", f"Job completed successfully with {data_count} items", db)
+                    self._queue_status_update(job_id, "completed")
                     
-            except Exception as e:
-                logger.error(f"Scraping job {job_id} failed: {str(e)}")
-                
-                # Update job status to failed
-                await self._update_job_status(job_id, "failed", db, str(e))
-                await db.commit()
-                
-            finally:
-                # Remove from active jobs
-                if job_id in self.active_jobs:
-                    del self.active_jobs[job_id]
-    
+                    logger.info(f"Scraping job {job_id} completed successfully with {data_count} items")
+                    
+                except Exception as e:
+                    error_message = str(e)
+                    logger.error(f"Scraping job {job_id} failed: {error_message}")
+                    
+                    # Log: Job failed
+                    await self._log_job_progress(job_id, "failed", f"Job failed: {error_message}", db)
+                    await self._update_job_status(job_id, "failed", db, error_message)
+
+    async def _log_job_progress(
+        self,
+        job_id: uuid.UUID,
+        stage: str,
+        message: str,
+        db: AsyncSession
+    ):
+        """Log job progress and queue a real-time update for broadcast"""
+        # Queue real-time progress update; the broadcaster sends it without blocking the job
+        if connection_manager.has_subscribers():
+            self._outbox.put_nowait({
+                "t": "p",
+                "j": job_id,
+                "s": stage,
+                "m": message,
+                "ts": int(time.time() * 1000)
+            })
+            self._ensure_broadcaster()
+        
+        # Log to application logs
+        logger.info(f"Job {job_id} [{stage}]: {message}")
+
+    def _ensure_broadcaster(self):
+        """Start the broadcast flusher on first use (no event loop exists at import time)"""
+        if self._broadcaster is None or self._broadcaster.done():
+            self._broadcaster = asyncio.create_task(self._flush_broadcasts())
+
+    async def _flush_broadcasts(self):
+        """Collect queued updates over a short window and broadcast them as a single frame"""
+        while True:
+            batch = [await self._outbox.get()]
+            await asyncio.sleep(_BROADCAST_WINDOW_SECONDS + random.uniform(0, _BROADCAST_JITTER_SECONDS))
+            while len(batch) < _BROADCAST_BATCH_SIZE:
+                try:
+                    batch.append(self._outbox.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            grouped: Dict[str, List[Dict[str, Any]]] = {}
+            for event in batch:
+                grouped.setdefault(event.pop("t"), []).append(event)
+            
+            # Hand the frame off so a slow client cannot hold up the next window
+            task = asyncio.create_task(self._safe_broadcast({
+                "type": "multi",
+                "events": [
+                    self._batch_envelope(event_type, events)
+                    for event_type, events in grouped.items()
+                ]
+            }))
+            self._broadcast_tasks.add(task)
+            task.add_done_callback(self._broadcast_tasks.discard)
+
+    @staticmethod
+    def _batch_envelope(event_type: str, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Wrap same-kind events, hoisting the job id when they all share one"""
+        envelope: Dict[str, Any] = {"type": _BATCH_TYPES[event_type]}
+        job_id = events[0]["j"]
+        if all(event["j"] == job_id for event in events):
+            envelope["j"] = job_id
+            for event in events:
+                del event["j"]
+        envelope["events"] = events
+        return envelope
+
+    async def _safe_broadcast(self, payload: Dict[str, Any]):
+        """Broadcast a frame to all clients, logging instead of raising on failure"""
+        # Everyone may have disconnected while the frame was being collected
+        if not connection_manager.has_subscribers():
+            return
+        try:
+            await connection_manager.broadcast_to_all(payload)
+        except Exception as e:
+            logger.error(f"Failed to broadcast job updates: {str(e)}")
+
     async def get_job(
         self,
         job_id: uuid.UUID,
@@ -300,9 +421,7 @@ class ScrapingService:
         Get a single job by ID
         """
         try:
-            result = await db.execute(
-                select(ScrapingJob).where(ScrapingJob.id == job_id)
-            )
+            result = await db.execute(_JOB_BY_ID_STMT, {"job_id": job_id})
             job = result.scalar_one_or_none()
             return job
             
@@ -319,74 +438,87 @@ class ScrapingService:
         Get the current status of a scraping job
         """
         try:
-            result = await db.execute(
-                select(ScrapingJob)
-                .options(
-                    selectinload(ScrapingJob.scripts),
-                    selectinload(ScrapingJob.extracted_data)
-                )
-                .where(ScrapingJob.id == job_id)
-            )
-            job = result.scalar_one_or_none()
+            result = await db.execute(_JOB_WITH_CHILDREN_STMT, {"job_id": job_id})
+            job = result.unique().scalar_one_or_none()
             
             if not job:
                 return None
             
-            return ScrapingJobResponse.from_orm(job)
+            return ScrapingJobResponse.model_validate(job, from_attributes=True)
+            
+        except Exception as e:
+            logger.exception(f"Failed to get job status for {job_id}")
+            raise ScrapingServiceError(f"Failed to get job status: {str(e)}") from e
+    
+    async def get_job_results_json(
+        self,
+        job_id: uuid.UUID,
+        db: AsyncSession
+    ) -> Optional[str]:
+        """
+        Get the extracted data for a job as JSON text built by the database:
+        the latest extraction for a completed job, or its status otherwise
+        """
+        try:
+            result = await db.execute(_JOB_RESULTS_JSON_SQL, {"job_id": job_id})
+            return result.scalar_one_or_none()
             
         except Exception as e:
-            logger.error(f"Failed to get job status for {job_id}: {str(e)}")
-            raise Exception(f"Failed to get job status: {str(e)}")
+            logger.exception(f"Failed to get job results for {job_id}")
+            raise ScrapingServiceError(f"Failed to get job results: {str(e)}") from e
     
-    async def get_job_results(
+    async def get_job_overview(
         self,
         job_id: uuid.UUID,
         db: AsyncSession
     ) -> Optional[Dict[str, Any]]:
         """
-        Get the extracted data for a completed job
+        Get a job's status and its latest script in a single query
         """
+        cached = self._overview_cache.get(job_id)
+        if cached and time.monotonic() - cached[0] < _OVERVIEW_TTL_SECONDS:
+            return cached[1]
+        
         try:
-            # Get job with extracted data
+            latest_script = (
+                select(GeneratedScript)
+                .where(GeneratedScript.job_id == ScrapingJob.id)
+                .order_by(GeneratedScript.created_at.desc())
+                .limit(1)
+                .lateral("latest_script")
+            )
+            script_alias = aliased(GeneratedScript, latest_script)
+            
             result = await db.execute(
-                select(ScrapingJob)
-                .options(selectinload(ScrapingJob.extracted_data))
+                select(ScrapingJob, script_alias)
+                .outerjoin(script_alias, true())
                 .where(ScrapingJob.id == job_id)
             )
-            job = result.scalar_one_or_none()
+            row = result.first()
             
-            if not job:
+            if not row:
                 return None
             
-            if job.status != "completed":
-                return {
-                    "status": job.status,
-                    "message": f"Job is in {job.status} status",
-                    "data": None
-                }
-            
-            # Get the latest extracted data
-            if job.extracted_data:
-                latest_data = max(job.extracted_data, key=lambda x: x.extracted_at)
-                return {
-                    "status": "completed",
-                    "job_id": str(job.id),
-                    "url": job.url,
-                    "data": latest_data.data,
-                    "data_count": latest_data.data_count,
-                    "extracted_at": latest_data.extracted_at.isoformat(),
-                    "schema_definition": job.schema_definition
-                }
-            else:
-                return {
-                    "status": "completed",
-                    "message": "No data extracted",
-                    "data": None
-                }
+            job, script = row
+            overview = {
+                "job": ScrapingJobResponse.model_validate(job, from_attributes=True).model_dump(mode="json"),
+                "script": {
+                    "script_id": str(script.id),
+                    "job_id": str(script.job_id),
+                    "script_content": script.script_content,
+                    "script_type": script.script_type,
+                    "created_at": script.created_at.isoformat()
+                } if script else None
+            }
+            
+            if len(self._overview_cache) >= _OVERVIEW_CACHE_MAX_ENTRIES:
+                self._overview_cache.clear()
+            self._overview_cache[job_id] = (time.monotonic(), overview)
+            return overview
             
         except Exception as e:
-            logger.error(f"Failed to get job results for {job_id}: {str(e)}")
-            raise Exception(f"Failed to get job results: {str(e)}")
+            logger.exception(f"Failed to get job overview for {job_id}")
+            raise ScrapingServiceError(f"Failed to get job overview: {str(e)}") from e
     
     async def get_job_script(
         self,
@@ -416,8 +548,8 @@ class ScrapingService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to get job script for {job_id}: {str(e)}")
-            raise Exception(f"Failed to get job script: {str(e)}")
+            logger.exception(f"Failed to get job script for {job_id}")
+            raise ScrapingServiceError(f"Failed to get job script: {str(e)}") from e
     
     async def cancel_job(
         self,
@@ -429,14 +561,14 @@ class ScrapingService:
         """
         try:
             # Cancel the async task if it's running
-            if job_id in self.active_jobs:
-                task = self.active_jobs[job_id]
+            task = self.active_jobs.pop(job_id, None)
+            if task:
                 task.cancel()
-                del self.active_jobs[job_id]
             
             # Update job status
-            await self._update_job_status(job_id, "cancelled", db)
+            await self._update_job_status(job_id, "cancelled", db, commit=False)
             await db.commit()
+            self._queue_status_update(job_id, "cancelled")
             
             return {
                 "status": "cancelled",
@@ -445,34 +577,39 @@ class ScrapingService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to cancel job {job_id}: {str(e)}")
-            raise Exception(f"Failed to cancel job: {str(e)}")
+            logger.exception(f"Failed to cancel job {job_id}")
+            raise ScrapingServiceError(f"Failed to cancel job: {str(e)}") from e
     
     async def list_jobs(
         self,
         db: AsyncSession,
         user_id: str = "anonymous",
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[datetime, uuid.UUID]] = None
     ) -> List[ScrapingJobResponse]:
         """
-        List scraping jobs for a user
+        List scraping jobs for a user, newest first. Pass the (created_at, id)
+        of the last job seen as cursor to page without scanning skipped rows.
         """
         try:
-            result = await db.execute(
-                select(ScrapingJob)
-                .where(ScrapingJob.user_id == user_id)
-                .order_by(ScrapingJob.created_at.desc())
-                .limit(limit)
-                .offset(offset)
-            )
+            if cursor:
+                result = await db.execute(
+                    _USER_JOBS_AFTER_STMT,
+                    {"user_id": user_id, "limit": limit, "cursor_created_at": cursor[0], "cursor_id": cursor[1]}
+                )
+            else:
+                result = await db.execute(
+                    _USER_JOBS_STMT,
+                    {"user_id": user_id, "limit": limit, "offset": offset}
+                )
             jobs = result.scalars().all()
             
-            return [ScrapingJobResponse.from_orm(job) for job in jobs]
+            return _job_list_adapter.validate_python(jobs, from_attributes=True)
             
         except Exception as e:
-            logger.error(f"Failed to list jobs: {str(e)}")
-            raise Exception(f"Failed to list jobs: {str(e)}")
+            logger.exception("Failed to list jobs")
+            raise ScrapingServiceError(f"Failed to list jobs: {str(e)}") from e
     
     async def delete_job(
         self,
@@ -484,21 +621,20 @@ class ScrapingService:
         """
         try:
             # Cancel if running
-            if job_id in self.active_jobs:
-                task = self.active_jobs[job_id]
+            task = self.active_jobs.pop(job_id, None)
+            if task:
                 task.cancel()
-                del self.active_jobs[job_id]
             
-            # Delete job (cascading will delete related records)
+            # Delete job (ON DELETE CASCADE removes related records)
             result = await db.execute(
-                select(ScrapingJob).where(ScrapingJob.id == job_id)
+                delete(ScrapingJob)
+                .where(ScrapingJob.id == job_id)
+                .returning(ScrapingJob.id)
             )
-            job = result.scalar_one_or_none()
             
-            if not job:
-                raise Exception(f"Job {job_id} not found")
+            if result.scalar_one_or_none() is None:
+                raise ScrapingServiceError(f"Job {job_id} not found")
             
-            await db.delete(job)
             await db.commit()
             
             return {
@@ -508,18 +644,20 @@ class ScrapingService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to delete job {job_id}: {str(e)}")
-            raise Exception(f"Failed to delete job: {str(e)}")
+            logger.exception(f"Failed to delete job {job_id}")
+            raise ScrapingServiceError(f"Failed to delete job: {str(e)}") from e
     
     async def _update_job_status(
         self,
         job_id: uuid.UUID,
         status: str,
         db: AsyncSession,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        commit: bool = True
     ):
         """
-        Update job status in database
+        Update job status in database. With commit=False the update is only
+        staged in the session; the caller commits and queues the broadcast.
         """
         update_data = {"status": status}
         
@@ -534,49 +672,87 @@ class ScrapingService:
             .where(ScrapingJob.id == job_id)
             .values(**update_data)
         )
-        await db.commit()
         
-        # Broadcast real-time update to all connected clients
-        try:
-            await connection_manager.broadcast_to_all({
-                "type": "job_status_update",
-                "job_id": str(job_id),
-                "status": status,
-                "error_message": error_message,
-                "timestamp": datetime.utcnow().isoformat()
-            })
-            logger.info(f"Broadcasted status update for job {job_id}: {status}")
-        except Exception as e:
-            logger.error(f"Failed to broadcast job update: {str(e)}")
+        if commit:
+            await db.commit()
+            self._queue_status_update(job_id, status, error_message)
+    
+    def _queue_status_update(
+        self,
+        job_id: uuid.UUID,
+        status: str,
+        error_message: Optional[str] = None
+    ):
+        """Queue a real-time status update for all connected clients"""
+        self._overview_cache.pop(job_id, None)
+        if not connection_manager.has_subscribers():
+            return
+        event = {"t": "u", "j": job_id, "s": status, "ts": int(time.time() * 1000)}
+        if error_message:
+            event["e"] = error_message
+        self._outbox.put_nowait(event)
+        self._ensure_broadcaster()
+        logger.info(f"Queued status update for job {job_id}: {status}")
     
     async def suggest_schema_for_url(
         self,
         url: str
     ) -> Dict[str, Any]:
         """
-        Analyze a URL and suggest an optimal extraction schema
+        Analyze a URL and suggest an optimal extraction schema.
+        Concurrent requests for the same URL share one analysis, and
+        successful results are reused for a few minutes.
         """
+        key = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+        
+        cached = self._suggest_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _SUGGEST_TTL_SECONDS:
+            return cached[1]
+        
+        inflight = self._suggest_inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._suggest_inflight[key] = future
         try:
-            async with PlaywrightService() as playwright_service:
+            suggestion = await self._suggest_schema(url)
+            if suggestion["status"] == "success":
+                if len(self._suggest_cache) >= _SUGGEST_CACHE_MAX_ENTRIES:
+                    self._suggest_cache.clear()
+                self._suggest_cache[key] = (time.monotonic(), suggestion)
+            future.set_result(suggestion)
+            return suggestion
+        finally:
+            self._suggest_inflight.pop(key, None)
+            if not future.done():
+                future.cancel()
+    
+    async def _suggest_schema(self, url: str) -> Dict[str, Any]:
+        """Load the page and ask the LLM for a schema"""
+        try:
+            playwright_service = await self._ensure_playwright()
+            async with self._browser_slots:
                 page_content = await playwright_service.get_page_content(url)
-                
-                if page_content["status"] == "error":
-                    raise Exception(f"Failed to load webpage: {page_content['error']}")
-                
-                # Use AI to detect schema
+            
+            if page_content["status"] == "error":
+                raise ScrapingServiceError(f"Failed to load webpage: {page_content['error']}")
+            
+            # Use AI to detect schema
+            async with self._llm_slots:
                 suggested_schema = await self.ai_service.detect_schema_from_html(
                     page_content["html_content"],
                     url
                 )
-                
-                return {
-                    "status": "success",
-                    "url": url,
-                    "suggested_schema": suggested_schema,
-                    "page_title": page_content.get("title", ""),
-                    "page_description": page_content.get("meta_description", "")
-                }
-                
+            
+            return {
+                "status": "success",
+                "url": url,
+                "suggested_schema": suggested_schema,
+                "page_title": page_content.get("title", ""),
+                "page_description": page_content.get("meta_description", "")
+            }
+            
         except Exception as e:
             logger.error(f"Failed to suggest schema for {url}: {str(e)}")
             return {
@@ -599,6 +775,3 @@ class ScrapingService:
 
 # Create a global instance
 scraping_service = ScrapingService()
-
-# Import AsyncSessionLocal here to avoid circular imports
-from ..core.database import AsyncSessionLocal
@@ -3,86 +3,240 @@ Schema Conversion Utilities
 Converts between different schema formats and validates data
 """
 
-from typing import Dict, Any, List, Optional, Union
-import json
+from typing import Callable, Dict, Any, FrozenSet, List, Mapping, Optional, Tuple, Union
+from types import MappingProxyType
+from dataclasses import dataclass
+import functools
 import re
 from ..schemas.extraction_schemas import (
     EnhancedSchemaDefinition, 
+    SchemaField,
     ENHANCED_SCHEMAS,
     get_schema_by_name
 )
 
+# Example values per field type
+_EXAMPLES: Mapping[str, str] = MappingProxyType({
+    "string": "Sample text value",
+    "number": "123",
+    "boolean": "true",
+    "array": "['item1', 'item2']",
+    "object": "{'key': 'value'}"
+})
+
+# CSS selector hints keyed by common field name fragments
+_SELECTOR_MAP: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    # Text content
+    "title": ("h1", "h2", "h3", ".title", ".headline", "[data-title]"),
+    "name": (".name", "h1", ".product-name", "[data-name]"),
+    "content": (".content", "article", "p", ".description", ".text"),
+    "description": (".description", ".desc", ".summary", "p"),
+    "text": ("p", ".text", ".content", "span"),
+
+    # Links and URLs
+    "url": ("a[href]", "link[href]", "[data-url]"),
+    "link": ("a[href]", "[href]"),
+    "website": ("a[href]", ".website", "[data-website]"),
+
+    # Contact info
+    "email": ("[href^='mailto:']", ".email", "[data-email]"),
+    "phone": ("[href^='tel:']", ".phone", ".tel", "[data-phone]"),
+    "address": (".address", ".location", "[data-address]"),
+
+    # Metadata
+    "author": (".author", ".byline", "[rel='author']", ".writer"),
+    "date": ("time", ".date", ".published", "[datetime]"),
+    "category": (".category", ".section", ".tag", "[data-category]"),
+    "price": (".price", ".cost", "[data-price]", ".amount"),
+    "rating": (".rating", ".stars", "[data-rating]", ".score"),
+
+    # Media
+    "image": ("img[src]", ".image img", "[data-image]"),
+    "video": ("video[src]", ".video", "[data-video]"),
+
+    # Social media
+    "likes": (".likes", ".hearts", "[data-likes]"),
+    "shares": (".shares", ".retweets", "[data-shares]"),
+    "comments": (".comments", ".replies", "[data-comments]"),
+
+    # Job listings
+    "company": (".company", ".employer", "[data-company]"),
+    "location": (".location", ".city", "[data-location]"),
+    "salary": (".salary", ".pay", ".compensation", "[data-salary]"),
+
+    # Products
+    "brand": (".brand", ".manufacturer", "[data-brand]"),
+    "availability": (".availability", ".stock", ".status", "[data-stock]")
+})
+
+# Keys earlier in _SELECTOR_MAP win when a field name contains several
+_SELECTOR_KEY_ORDER: Mapping[str, int] = MappingProxyType({key: i for i, key in enumerate(_SELECTOR_MAP)})
+_SELECTOR_KEY_PATTERN = re.compile("(?=(" + "|".join(re.escape(key) for key in _SELECTOR_MAP) + "))")
+
+@functools.lru_cache(maxsize=512)
+def _selector_hints(field_name: str) -> Tuple[str, ...]:
+    # Field names repeat across schemas, so each distinct name is resolved once
+    field_lower = field_name.lower()
+    
+    # Exact names are the common case; no key is a substring of another,
+    # so this matches what the scan below would find
+    selectors = _SELECTOR_MAP.get(field_lower)
+    if selectors is not None:
+        return selectors
+    
+    # Every selector key occurring in the name, in a single regex scan; the
+    # lookahead also reports overlapping occurrences
+    hits = _SELECTOR_KEY_PATTERN.findall(field_lower)
+    if hits:
+        return _SELECTOR_MAP[min(hits, key=_SELECTOR_KEY_ORDER.__getitem__)]
+    
+    # Fragments of a key, e.g. "desc" for "description"
+    for key, selectors in _SELECTOR_MAP.items():
+        if field_lower in key:
+            return selectors
+    
+    # Default selectors
+    return (f".{field_name}", f"[data-{field_name}]", f"#{field_name}")
+
+@functools.lru_cache(maxsize=1024)
+def _field_description(field_name: str) -> str:
+    return f"Extract {field_name} from the page"
+
+@functools.lru_cache(maxsize=256)
+def _schema_description(title: str) -> str:
+    return f"Extract {title.lower()} data from web pages"
+
+@dataclass(slots=True)
+class _FieldDraft:
+    """Field of a converted schema definition; converted to a dict at the API boundary"""
+    name: str
+    type: str
+    required: bool
+    description: str
+    example: str
+    selector_hints: Tuple[str, ...]
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "required": self.required,
+            "description": self.description,
+            "example": self.example,
+            "selector_hints": self.selector_hints
+        }
+
+# Checks one field value, returning an error message or None
+FieldValidator = Callable[[Any], Optional[str]]
+
+_MISSING = object()
+
+def _accept_any(value: Any) -> Optional[str]:
+    return None
+
+def _compile_field_validator(field_name: str, field_def: SchemaField) -> FieldValidator:
+    """Build a validator for one field with its type and constraints bound in"""
+    field_type = field_def.type
+    
+    if field_type == "string":
+        min_length = field_def.min_length
+        max_length = field_def.max_length
+        # Invalid regex patterns are skipped
+        match = field_def._match
+        not_string = f"Field '{field_name}' must be a string"
+        too_short = f"Field '{field_name}' must be at least {min_length} characters"
+        too_long = f"Field '{field_name}' must be at most {max_length} characters"
+        no_match = f"Field '{field_name}' does not match required pattern"
+        
+        def validate_string(value: Any) -> Optional[str]:
+            if type(value) is not str:
+                return not_string
+            if min_length and len(value) < min_length:
+                return too_short
+            if max_length and len(value) > max_length:
+                return too_long
+            if match is not None and match(value) is None:
+                return no_match
+            return None
+        
+        return validate_string
+    
+    if field_type == "number":
+        not_number = f"Field '{field_name}' must be a number"
+        return lambda value: None if isinstance(value, (int, float)) else not_number
+    
+    if field_type == "boolean":
+        not_boolean = f"Field '{field_name}' must be a boolean"
+        return lambda value: None if type(value) is bool else not_boolean
+    
+    return _accept_any
+
 class SchemaConverter:
     """Convert between different schema formats and validate data"""
     
     @staticmethod
     def enhanced_to_simple(enhanced_schema: EnhancedSchemaDefinition) -> Dict[str, Any]:
         """Convert enhanced schema to simple format used by AI service"""
+        type_map = {}
+        for field_name, field in enhanced_schema.fields.items():
+            type_map[field_name] = field.type.value
+        
         if enhanced_schema.type == "array":
-            return {
-                "type": "array",
-                "items": {
-                    field_name: field.type.value 
-                    for field_name, field in enhanced_schema.fields.items()
-                }
-            }
+            return {"type": "array", "items": type_map}
         else:
-            return {
-                "type": "object",
-                "properties": {
-                    field_name: field.type.value 
-                    for field_name, field in enhanced_schema.fields.items()
-                }
-            }
+            return {"type": "object", "properties": type_map}
     
     @staticmethod
     def simple_to_enhanced_schema_def(simple_schema: Dict[str, Any], title: str = "Custom Schema") -> Dict[str, Any]:
-        """Convert simple schema format to enhanced schema definition format"""
+        """
+        Convert simple schema format to enhanced schema definition format.
+        Fields are returned as _FieldDraft objects; use as_dict() for plain dicts.
+        """
         
         if simple_schema.get("type") == "array" and "items" in simple_schema:
             # Array schema
-            fields = {}
+            fields: Dict[str, _FieldDraft] = {}
             items = simple_schema["items"]
             
             for field_name, field_type in items.items():
-                fields[field_name] = {
-                    "name": field_name,
-                    "type": field_type,
-                    "required": True,  # Default to required
-                    "description": f"Extract {field_name} from the page",
-                    "example": SchemaConverter._get_example_for_type(field_type),
-                    "selector_hints": SchemaConverter._get_selector_hints_for_field(field_name)
-                }
+                fields[field_name] = _FieldDraft(
+                    name=field_name,
+                    type=field_type,
+                    required=True,  # Default to required
+                    description=_field_description(field_name),
+                    example=SchemaConverter._get_example_for_type(field_type),
+                    selector_hints=SchemaConverter._get_selector_hints_for_field(field_name)
+                )
             
             return {
                 "type": "array",
                 "title": title,
-                "description": f"Extract {title.lower()} data from web pages",
+                "description": _schema_description(title),
                 "fields": fields
             }
         
         elif simple_schema.get("type") == "object":
             # Object schema
-            fields = {}
+            fields: Dict[str, _FieldDraft] = {}
             properties = simple_schema.get("properties", simple_schema.get("items", {}))
             
             for field_name, field_info in properties.items():
                 field_type = field_info if isinstance(field_info, str) else field_info.get("type", "string")
                 required = field_info.get("required", True) if isinstance(field_info, dict) else True
                 
-                fields[field_name] = {
-                    "name": field_name,
-                    "type": field_type,
-                    "required": required,
-                    "description": f"Extract {field_name} from the page",
-                    "example": SchemaConverter._get_example_for_type(field_type),
-                    "selector_hints": SchemaConverter._get_selector_hints_for_field(field_name)
-                }
+                fields[field_name] = _FieldDraft(
+                    name=field_name,
+                    type=field_type,
+                    required=required,
+                    description=_field_description(field_name),
+                    example=SchemaConverter._get_example_for_type(field_type),
+                    selector_hints=SchemaConverter._get_selector_hints_for_field(field_name)
+                )
             
             return {
                 "type": "object", 
                 "title": title,
-                "description": f"Extract {title.lower()} data from web pages",
+                "description": _schema_description(title),
                 "fields": fields
             }
         
@@ -92,70 +246,12 @@ class SchemaConverter:
     @staticmethod
     def _get_example_for_type(field_type: str) -> str:
         """Get example value for field type"""
-        examples = {
-            "string": "Sample text value",
-            "number": "123",
-            "boolean": "true",
-            "array": "['item1', 'item2']",
-            "object": "{'key': 'value'}"
-        }
-        return examples.get(field_type, "Sample value")
+        return _EXAMPLES.get(field_type, "Sample value")
     
     @staticmethod
-    def _get_selector_hints_for_field(field_name: str) -> List[str]:
+    def _get_selector_hints_for_field(field_name: str) -> Tuple[str, ...]:
         """Get CSS selector hints based on field name"""
-        selector_map = {
-            # Text content
-            "title": ["h1", "h2", "h3", ".title", ".headline", "[data-title]"],
-            "name": [".name", "h1", ".product-name", "[data-name]"],
-            "content": [".content", "article", "p", ".description", ".text"],
-            "description": [".description", ".desc", ".summary", "p"],
-            "text": ["p", ".text", ".content", "span"],
-            
-            # Links and URLs
-            "url": ["a[href]", "link[href]", "[data-url]"],
-            "link": ["a[href]", "[href]"],
-            "website": ["a[href]", ".website", "[data-website]"],
-            
-            # Contact info
-            "email": ["[href^='mailto:']", ".email", "[data-email]"],
-            "phone": ["[href^='tel:']", ".phone", ".tel", "[data-phone]"],
-            "address": [".address", ".location", "[data-address]"],
-            
-            # Metadata
-            "author": [".author", ".byline", "[rel='author']", ".writer"],
-            "date": ["time", ".date", ".published", "[datetime]"],
-            "category": [".category", ".section", ".tag", "[data-category]"],
-            "price": [".price", ".cost", "[data-price]", ".amount"],
-            "rating": [".rating", ".stars", "[data-rating]", ".score"],
-            
-            # Media
-            "image": ["img[src]", ".image img", "[data-image]"],
-            "video": ["video[src]", ".video", "[data-video]"],
-            
-            # Social media
-            "likes": [".likes", ".hearts", "[data-likes]"],
-            "shares": [".shares", ".retweets", "[data-shares]"],
-            "comments": [".comments", ".replies", "[data-comments]"],
-            
-            # Job listings
-            "company": [".company", ".employer", "[data-company]"],
-            "location": [".location", ".city", "[data-location]"],
-            "salary": [".salary", ".pay", ".compensation", "[data-salary]"],
-            
-            # Products
-            "brand": [".brand", ".manufacturer", "[data-brand]"],
-            "availability": [".availability", ".stock", ".status", "[data-stock]"]
-        }
-        
-        # Find the best match for field name
-        field_lower = field_name.lower()
-        for key, selectors in selector_map.items():
-            if key in field_lower or field_lower in key:
-                return selectors
-        
-        # Default selectors
-        return [f".{field_name}", f"[data-{field_name}]", f"#{field_name}"]
+        return _selector_hints(field_name)
 
 class SchemaValidator:
     """Validate extracted data against schemas"""
@@ -163,7 +259,7 @@ class SchemaValidator:
     @staticmethod
     def validate_data(data: Any, schema_name: str) -> Dict[str, Any]:
         """Validate extracted data against named schema"""
-        enhanced_schema = get_schema_by_name(schema_name)
+        enhanced_schema = ENHANCED_SCHEMAS.get(schema_name)
         if not enhanced_schema:
             return {"valid": False, "error": f"Schema '{schema_name}' not found"}
         
@@ -172,73 +268,74 @@ class SchemaValidator:
     @staticmethod
     def validate_against_enhanced_schema(data: Any, schema: EnhancedSchemaDefinition) -> Dict[str, Any]:
         """Validate data against enhanced schema definition"""
-        try:
-            if schema.type == "array":
-                if not isinstance(data, list):
-                    return {"valid": False, "error": "Data must be an array"}
-                
-                if len(data) == 0:
-                    return {"valid": False, "error": "Array must contain at least one item"}
-                
-                # Validate each item
-                for i, item in enumerate(data):
-                    if not isinstance(item, dict):
-                        return {"valid": False, "error": f"Item {i} must be an object"}
-                    
-                    item_validation = SchemaValidator._validate_object(item, schema.fields)
-                    if not item_validation["valid"]:
-                        return {"valid": False, "error": f"Item {i}: {item_validation['error']}"}
+        required = schema.required_fields
+        validators = SchemaValidator._field_validators(schema)
+        
+        if schema.type == "array":
+            if not isinstance(data, list):
+                return {"valid": False, "error": "Data must be an array"}
             
-            else:  # object
-                if not isinstance(data, dict):
-                    return {"valid": False, "error": "Data must be an object"}
-                
-                validation = SchemaValidator._validate_object(data, schema.fields)
-                if not validation["valid"]:
-                    return validation
+            if len(data) == 0:
+                return {"valid": False, "error": "Array must contain at least one item"}
             
-            return {"valid": True, "data": data}
+            # Validate each item; hoist the lookups that would otherwise repeat per item
+            validate_object = SchemaValidator._validate_object
+            fields = schema.fields
+            for i, item in enumerate(data):
+                if not isinstance(item, dict):
+                    return {"valid": False, "error": f"Item {i} must be an object"}
+                
+                error = validate_object(item, fields, required, validators)
+                if error is not None:
+                    return {"valid": False, "error": f"Item {i}: {error}"}
+        
+        else:  # object
+            if not isinstance(data, dict):
+                return {"valid": False, "error": "Data must be an object"}
             
-        except Exception as e:
-            return {"valid": False, "error": f"Validation error: {str(e)}"}
+            error = SchemaValidator._validate_object(data, schema.fields, required, validators)
+            if error is not None:
+                return {"valid": False, "error": error}
+        
+        return {"valid": True, "data": data}
+    
+    @staticmethod
+    def _field_validators(schema: EnhancedSchemaDefinition) -> Tuple[Tuple[str, FieldValidator], ...]:
+        """Get the schema's (field name, validator) pairs, compiled once per schema"""
+        return schema.compiled_validators(SchemaValidator._compile_or_skip)
     
     @staticmethod
-    def _validate_object(obj: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate object against field definitions"""
+    def _compile_or_skip(field_name: str, field_def: Any) -> Optional[FieldValidator]:
+        """Compile a field validator, or None for fields without a type check"""
+        validator = _compile_field_validator(field_name, field_def)
+        # Fields without a type check need no per-record work at all
+        return None if validator is _accept_any else validator
+    
+    @staticmethod
+    def _validate_object(
+        obj: Dict[str, Any],
+        fields: Dict[str, Any],
+        required: FrozenSet[str],
+        validators: Tuple[Tuple[str, FieldValidator], ...]
+    ) -> Optional[str]:
+        """Validate object against field definitions, returning the first error or None"""
         # Check required fields
-        for field_name, field_def in fields.items():
-            if field_def.required and field_name not in obj:
-                return {"valid": False, "error": f"Required field '{field_name}' is missing"}
+        missing = required - obj.keys()
+        if missing:
+            field_name = next(name for name in fields if name in missing)
+            return f"Required field '{field_name}' is missing"
         
-        # Validate field types and constraints
-        for field_name, value in obj.items():
-            if field_name in fields:
-                field_def = fields[field_name]
-                
-                # Type validation
-                if field_def.type == "string" and not isinstance(value, str):
-                    return {"valid": False, "error": f"Field '{field_name}' must be a string"}
-                elif field_def.type == "number" and not isinstance(value, (int, float)):
-                    return {"valid": False, "error": f"Field '{field_name}' must be a number"}
-                elif field_def.type == "boolean" and not isinstance(value, bool):
-                    return {"valid": False, "error": f"Field '{field_name}' must be a boolean"}
-                
-                # String constraints
-                if field_def.type == "string" and isinstance(value, str):
-                    if field_def.min_length and len(value) < field_def.min_length:
-                        return {"valid": False, "error": f"Field '{field_name}' must be at least {field_def.min_length} characters"}
-                    if field_def.max_length and len(value) > field_def.max_length:
-                        return {"valid": False, "error": f"Field '{field_name}' must be at most {field_def.max_length} characters"}
-                    
-                    # Pattern validation
-                    if field_def.validation_pattern:
-                        try:
-                            if not re.match(field_def.validation_pattern, value):
-                                return {"valid": False, "error": f"Field '{field_name}' does not match required pattern"}
-                        except re.error:
-                            pass  # Skip invalid regex patterns
+        # Validate field types and constraints in one pass over the schema side,
+        # so extra keys in the object cost nothing
+        obj_get = obj.get
+        for field_name, validator in validators:
+            value = obj_get(field_name, _MISSING)
+            if value is not _MISSING:
+                error = validator(value)
+                if error is not None:
+                    return error
         
-        return {"valid": True}
+        return None
 
 # Export convenience functions
 def get_enhanced_schema(name: str) -> Optional[EnhancedSchemaDefinition]:
@@ -247,7 +344,9 @@ def get_enhanced_schema(name: str) -> Optional[EnhancedSchemaDefinition]:
 
 def convert_simple_to_enhanced(simple_schema: Dict[str, Any], title: str = "Custom Schema") -> Dict[str, Any]:
     """Convert simple schema to enhanced format"""
-    return SchemaConverter.simple_to_enhanced_schema_def(simple_schema, title)
+    schema_def = SchemaConverter.simple_to_enhanced_schema_def(simple_schema, title)
+    schema_def["fields"] = {name: draft.as_dict() for name, draft in schema_def["fields"].items()}
+    return schema_def
 
 def validate_extracted_data(data: Any, schema_name: str) -> Dict[str, Any]:
     """Validate extracted data"""
@@ -257,16 +356,20 @@ def get_available_schemas() -> List[str]:
     """Get list of available schema names"""
     return list(ENHANCED_SCHEMAS.keys())
 
+# Built-in schemas never change, so their JSON Schema / Zod renderings are
+# cached; callers must treat the returned objects as read-only
+@functools.lru_cache(maxsize=128)
 def get_schema_json(schema_name: str) -> Optional[Dict[str, Any]]:
     """Get schema as JSON Schema format"""
-    schema = get_schema_by_name(schema_name)
+    schema = ENHANCED_SCHEMAS.get(schema_name)
     if schema:
         return schema.to_json_schema()
     return None
 
+@functools.lru_cache(maxsize=128)
 def get_schema_zod(schema_name: str) -> Optional[str]:
     """Get schema as Zod TypeScript code"""
-    schema = get_schema_by_name(schema_name)
+    schema = ENHANCED_SCHEMAS.get(schema_name)
     if schema:
         return schema.to_zod_schema()
     return None
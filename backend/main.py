@@ -1,8 +1,10 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
 import sys
+import time
 from contextlib import asynccontextmanager
 
 # Configure logging
@@ -29,13 +31,21 @@ async def lifespan(app: FastAPI):
         await init_db()
         logger.info("Database initialized successfully")
         
-        # Install Playwright browsers if needed
-        try:
-            import subprocess
-            subprocess.run(["playwright", "install", "chromium"], check=True, capture_output=True)
-            logger.info("Playwright browsers installed/verified")
-        except Exception as e:
-            logger.warning(f"Could not install Playwright browsers: {e}")
+        # Browsers are installed at image build time; local setups can opt in here
+        from app.core.config import settings
+        if settings.auto_install_browsers:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable, "-m", "playwright", "install", "chromium",
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                _, stderr = await process.communicate()
+                if process.returncode != 0:
+                    raise RuntimeError(stderr.decode(errors="replace").strip())
+                logger.info("Playwright browsers installed/verified")
+            except Exception as e:
+                logger.warning(f"Could not install Playwright browsers: {e}")
         
     except Exception as e:
         logger.error(f"Failed to initialize application: {e}")
@@ -45,13 +55,19 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down LLM Web Scraper Application")
+    
+    from app.services.scraping_service import scraping_service
+    from app.services.playwright_service import PlaywrightService
+    await scraping_service.close()
+    PlaywrightService.close_http_cache()
 
 # Create FastAPI application
 app = FastAPI(
     title="LLM Web Scraper API",
     description="AI-powered web scraping application that generates custom Playwright scripts",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS - More permissive for development
@@ -82,15 +98,22 @@ async def root():
         "status": "running"
     }
 
+# Liveness probes poll often; a successful DB check is reused for this long
+_HEALTH_CACHE_SECONDS = 1.0
+_last_healthy_at = 0.0
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    global _last_healthy_at
     try:
-        # Check database connection
-        from app.core.database import engine
-        from sqlalchemy import text
-        async with engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
+        # Check database connection (no transaction needed for SELECT 1)
+        if time.monotonic() - _last_healthy_at > _HEALTH_CACHE_SECONDS:
+            from app.core.database import engine
+            from sqlalchemy import text
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            _last_healthy_at = time.monotonic()
         
         return {
             "status": "healthy",
@@ -99,7 +122,7 @@ async def health_check():
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
@@ -113,7 +136,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error",
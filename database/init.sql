@@ -46,6 +46,7 @@ CREATE TABLE script_templates (
 CREATE INDEX idx_scraping_jobs_status ON scraping_jobs(status);
 CREATE INDEX idx_scraping_jobs_created_at ON scraping_jobs(created_at);
 CREATE INDEX idx_scraping_jobs_url ON scraping_jobs(url);
+CREATE INDEX idx_scraping_jobs_user_created ON scraping_jobs(user_id, created_at DESC, id DESC);
 CREATE INDEX idx_generated_scripts_job_id ON generated_scripts(job_id);
 CREATE INDEX idx_extracted_data_job_id ON extracted_data(job_id);
 CREATE INDEX idx_extracted_data_extracted_at ON extracted_data(extracted_at);
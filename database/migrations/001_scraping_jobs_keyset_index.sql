@@ -0,0 +1,2 @@
+-- Composite index backing keyset pagination of a user's jobs (newest first)
+CREATE INDEX IF NOT EXISTS idx_scraping_jobs_user_created ON scraping_jobs(user_id, created_at DESC, id DESC);
@@ -1,4 +1,4 @@
-import { WebSocketMessage } from '../types';
+import { CompactEvent, WebSocketMessage } from '../types';
 
 export class WebSocketService {
   private ws: WebSocket | null = null;
@@ -10,6 +10,7 @@ export class WebSocketService {
   private isConnecting: boolean = false;
   private messageHandlers: Map<string, Set<(message: WebSocketMessage) => void>> = new Map();
   private connectionHandlers: Set<(connected: boolean) => void> = new Set();
+  private decoder: TextDecoder = new TextDecoder();
 
   constructor(clientId?: string) {
     this.clientId = clientId || this.generateClientId();
@@ -56,6 +57,7 @@ export class WebSocketService {
 
       try {
         this.ws = new WebSocket(this.url);
+        this.ws.binaryType = 'arraybuffer';
 
         this.ws.onopen = () => {
           console.log('WebSocket connected');
@@ -68,7 +70,9 @@ export class WebSocketService {
 
         this.ws.onmessage = (event) => {
           try {
-            const message: WebSocketMessage = JSON.parse(event.data);
+            // Broadcasts arrive as binary frames of UTF-8 JSON
+            const data = typeof event.data === 'string' ? event.data : this.decoder.decode(event.data);
+            const message: WebSocketMessage = JSON.parse(data);
             this.handleMessage(message);
           } catch (error) {
             console.error('Failed to parse WebSocket message:', error);
@@ -127,6 +131,16 @@ export class WebSocketService {
   }
 
   private handleMessage(message: WebSocketMessage): void {
+    // Batched envelopes are unpacked so handlers only ever see single events
+    if (message.type === 'multi') {
+      message.events?.forEach(event => this.handleMessage(event as WebSocketMessage));
+      return;
+    }
+    if (message.type === 'job_progress_batch' || message.type === 'job_status_batch') {
+      message.events?.forEach(event => this.handleMessage(this.expandBatchEvent(message, event as CompactEvent)));
+      return;
+    }
+
     console.log('WebSocket message received:', message);
 
     // Notify specific message type handlers
@@ -142,6 +156,15 @@ export class WebSocketService {
     }
   }
 
+  // Batched events use short keys; map them back to the regular message shape
+  private expandBatchEvent(batch: WebSocketMessage, event: CompactEvent): WebSocketMessage {
+    const jobId = event.j ?? batch.j;
+    if (batch.type === 'job_progress_batch') {
+      return { type: 'job_progress', job_id: jobId, stage: event.s, message: event.m, timestamp: event.ts };
+    }
+    return { type: 'job_status_update', job_id: jobId, status: event.s, error_message: event.e, timestamp: event.ts };
+  }
+
   // Subscribe to specific message types
   subscribe(messageType: string, handler: (message: WebSocketMessage) => void): () => void {
     if (!this.messageHandlers.has(messageType)) {
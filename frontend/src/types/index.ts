@@ -59,7 +59,7 @@ export interface SuggestedSchema {
 
 // WebSocket Message Types
 export interface WebSocketMessage {
-  type: 'job_started' | 'job_progress' | 'job_completed' | 'job_failed' | 'job_cancelled' | 'job_status_update' | 'subscribed' | 'unsubscribed' | 'error' | 'pong';
+  type: 'job_started' | 'job_progress' | 'job_progress_batch' | 'job_status_batch' | 'multi' | 'job_completed' | 'job_failed' | 'job_cancelled' | 'job_status_update' | 'subscribed' | 'unsubscribed' | 'error' | 'pong';
   job_id?: string;
   timestamp?: number | string;
   url?: string;
@@ -72,6 +72,17 @@ export interface WebSocketMessage {
   error_message?: string;
   message?: string;
   results_available?: boolean;
+  events?: (WebSocketMessage | CompactEvent)[];
+  j?: string;
+}
+
+// Short-key event inside a job_progress_batch / job_status_batch envelope
+export interface CompactEvent {
+  j?: string;
+  s?: string;
+  m?: string;
+  e?: string;
+  ts?: number;
 }
 
 // Schema Builder Types